@@ -1,10 +1,24 @@
-from flask import Blueprint
+# Import ringan: blueprint dan factory baru dimuat saat atributnya diakses,
+# sehingga `import project_api` tidak mengimpor seluruh route.
 
-# Import semua blueprint dari routes
-from project_api.routes import api_bp
+_main_bp = None
 
-# Buat blueprint utama untuk project_api
-main_bp = Blueprint('main', __name__)
 
-# Register blueprint API
-main_bp.register_blueprint(api_bp)
+def __getattr__(name):
+    global _main_bp
+    if name == 'create_app':
+        from project_api.factory import create_app
+        return create_app
+    if name == 'api_bp':
+        # Import semua blueprint dari routes
+        from project_api.routes import api_bp
+        return api_bp
+    if name == 'main_bp':
+        if _main_bp is None:
+            from flask import Blueprint
+            from project_api.routes import api_bp
+            # Blueprint utama untuk project_api
+            _main_bp = Blueprint('main', __name__)
+            _main_bp.register_blueprint(api_bp)
+        return _main_bp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
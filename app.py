@@ -1,14 +1,8 @@
-from flask import Flask, jsonify
-from project_api import api_bp  # Import blueprint utama
+from project_api.factory import create_app
+from project_api.my_socket import socketio
 
-app = Flask(__name__)
-
-@app.route('/')
-def home():
-    return jsonify({"message": "WebSocket Flask API is running!"}), 200
-
-# Daftarkan blueprint API
-app.register_blueprint(api_bp)
+# Satu aplikasi per proses/worker (gunicorn: project_api.app:app)
+app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)  # Akses dari luar jaringan lokal
+    socketio.run(app, host='0.0.0.0', port=5000, debug=True)  # Akses dari luar jaringan lokal
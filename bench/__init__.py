@@ -0,0 +1,5 @@
+# Benchmark HTTP untuk API order (hanya stdlib: threading + urllib).
+# Jalankan terhadap server yang terhubung ke MySQL lokal, bukan database produksi
+# (server membaca DB_HOST/DB_PORT/DB_USER/DB_PASSWORD/DB_NAME dari environment):
+#   DB_HOST=127.0.0.1 DB_NAME=db_mnk_bench python -m project_api.app
+#   python -m project_api.bench --base-url http://127.0.0.1:5000 --seed-orders 2000 --concurrency 1,8,32
@@ -0,0 +1,102 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+from project_api.bench.client import Client
+from project_api.bench.runner import run_level
+from project_api.bench.workload import MIXES, OrderPool, seed_orders
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m project_api.bench',
+                                     description='Benchmark throughput/latency endpoint order')
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--seed-orders', type=int, default=1000,
+                        help='jumlah order yang dibuat lewat /api/input-order/bulk sebelum run (0: lewati)')
+    parser.add_argument('--mix', choices=sorted(MIXES), default='default')
+    parser.add_argument('--concurrency', default='1,8,32', help='level concurrency, dipisah koma')
+    parser.add_argument('--duration', type=float, default=30.0, help='detik per level')
+    parser.add_argument('--warmup', type=float, default=3.0, help='detik awal per level yang tidak dihitung')
+    parser.add_argument('--page-size', type=int, default=0,
+                        help='limit untuk get_sorted_orders (0: tanpa pagination, seluruh tabel)')
+    parser.add_argument('--seed', type=int, default=0, help='seed RNG supaya run bisa diulang')
+    parser.add_argument('--label', default='', help='label bebas, mis. nama branch/commit')
+    parser.add_argument('--out', default=None, help='file JSON hasil (default bench_results/<waktu>.json)')
+    parser.add_argument('--compare', default=None, help='file JSON run sebelumnya untuk dibandingkan')
+    return parser.parse_args(argv)
+
+
+def print_level(level):
+    print(f"\n== concurrency {level['concurrency']}: {level['overall']['rps']} req/s, "
+          f"p50 {level['overall']['p50_ms']} ms, p95 {level['overall']['p95_ms']} ms, "
+          f"p99 {level['overall']['p99_ms']} ms")
+    print(f"{'endpoint':<22}{'req':>7}{'err':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for op, stats in level['endpoints'].items():
+        print(f"{op:<22}{stats['requests']:>7}{stats['errors']:>6}{stats['rps']:>9}"
+              f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+
+
+def print_comparison(previous, current):
+    """ Perubahan req/s dan p95 per endpoint untuk level concurrency yang sama """
+    old_levels = {level['concurrency']: level for level in previous.get('levels', [])}
+    print(f"\n== dibanding {previous.get('label') or previous.get('started_at')}")
+    for level in current['levels']:
+        old = old_levels.get(level['concurrency'])
+        if not old:
+            continue
+        print(f"concurrency {level['concurrency']}:")
+        for op, stats in level['endpoints'].items():
+            before = old['endpoints'].get(op)
+            if not before or not before['rps'] or not before['p95_ms']:
+                continue
+            rps_change = (stats['rps'] - before['rps']) / before['rps'] * 100
+            p95_change = (stats['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+            print(f"  {op:<22} req/s {before['rps']} -> {stats['rps']} ({rps_change:+.1f}%), "
+                  f"p95 {before['p95_ms']} -> {stats['p95_ms']} ms ({p95_change:+.1f}%)")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    client = Client(args.base_url)
+    levels = [int(value) for value in args.concurrency.split(',') if value.strip()]
+
+    pool = OrderPool()
+    if args.seed_orders:
+        print(f"Seeding {args.seed_orders} order ke {args.base_url} ...")
+        pool.extend(seed_orders(client, args.seed_orders, seed=args.seed))
+
+    result = {
+        'label': args.label,
+        'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'base_url': args.base_url,
+        'mix': args.mix,
+        'weights': MIXES[args.mix],
+        'seed_orders': args.seed_orders,
+        'page_size': args.page_size,
+        'seed': args.seed,
+        'host': {'python': platform.python_version(), 'machine': platform.machine()},
+        'levels': [],
+    }
+    for concurrency in levels:
+        level = run_level(client, pool, args.mix, concurrency, args.duration, args.warmup,
+                          seed=args.seed, options={'page_size': args.page_size})
+        result['levels'].append(level)
+        print_level(level)
+
+    out = args.out or os.path.join('bench_results', datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w') as fh:
+        json.dump(result, fh, indent=2)
+    print(f"\nHasil disimpan ke {out}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            print_comparison(json.load(fh), result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
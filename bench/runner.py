@@ -0,0 +1,105 @@
+import math
+import random
+import threading
+import time
+
+from project_api.bench.workload import MIXES, OPERATIONS
+
+
+def percentile(sorted_values, pct):
+    """ Persentil nearest-rank dari list yang sudah diurutkan """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples, wall_seconds):
+    """ samples: {op: [(status, detik), ...]} -> statistik per endpoint + total """
+    endpoints = {}
+    all_latencies = []
+    total_requests = 0
+    for op, records in sorted(samples.items()):
+        latencies = sorted(elapsed for _, elapsed in records)
+        all_latencies.extend(latencies)
+        total_requests += len(records)
+        endpoints[op] = _stats(records, latencies, wall_seconds)
+
+    all_latencies.sort()
+    overall = {
+        'requests': total_requests,
+        'rps': round(total_requests / wall_seconds, 1) if wall_seconds else None,
+        'p50_ms': _ms(percentile(all_latencies, 50)),
+        'p95_ms': _ms(percentile(all_latencies, 95)),
+        'p99_ms': _ms(percentile(all_latencies, 99)),
+    }
+    return endpoints, overall
+
+
+def _stats(records, latencies, wall_seconds):
+    statuses = {}
+    for status, _ in records:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(1 for status, _ in records if status == 0 or status >= 500)
+    return {
+        'requests': len(records),
+        'errors': errors,
+        'statuses': statuses,
+        'rps': round(len(records) / wall_seconds, 1) if wall_seconds else None,
+        'mean_ms': _ms(sum(latencies) / len(latencies)) if latencies else None,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+        'max_ms': _ms(latencies[-1]) if latencies else None,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def run_level(client, pool, mix, concurrency, duration, warmup=0.0, seed=0, options=None):
+    """
+    Jalankan `mix` dengan `concurrency` thread selama `duration` detik (setelah `warmup` detik
+    yang tidak dihitung). Setiap thread memilih operasi acak sesuai bobot mix.
+    """
+    weights = MIXES[mix] if isinstance(mix, str) else mix
+    ops = list(weights)
+    op_weights = [weights[op] for op in ops]
+    options = options or {}
+
+    samples = {op: [] for op in ops}
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        local = {op: [] for op in ops}
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            op = rng.choices(ops, op_weights)[0]
+            result = OPERATIONS[op](client, pool, rng, options)
+            if result is not None and now >= start_at:
+                local[op].append(result)
+        with lock:
+            for op, records in local.items():
+                samples[op].extend(records)
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"bench-{i}", daemon=True)
+               for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    endpoints, overall = summarize({op: records for op, records in samples.items() if records}, duration)
+    return {
+        'concurrency': concurrency,
+        'duration_s': duration,
+        'warmup_s': warmup,
+        'overall': overall,
+        'endpoints': endpoints,
+    }
@@ -0,0 +1,161 @@
+import datetime
+import random
+import threading
+
+# Bobot tiap operasi per skenario (proporsi request, bukan persentase pasti)
+MIXES = {
+    'default': {
+        'get_sorted_orders': 40,
+        'update_design': 20,
+        'sync_prod': 20,
+        'input_order': 10,
+        'move_to_table_urgent': 5,
+        'delete_order': 5,
+    },
+    'read_heavy': {
+        'get_sorted_orders': 80,
+        'update_design': 8,
+        'sync_prod': 8,
+        'input_order': 4,
+    },
+    'write_heavy': {
+        'get_sorted_orders': 10,
+        'update_design': 30,
+        'sync_prod': 30,
+        'input_order': 20,
+        'move_to_table_urgent': 5,
+        'delete_order': 5,
+    },
+}
+
+PLATFORMS = ['Shopee', 'Tokopedia', 'TikTok', 'Lazada', 'WhatsApp']
+STATUS_PRINT = ['-', 'Proses', 'Selesai']
+STATUS_PRODUKSI = ['-', 'Dijahit', 'QC', 'Selesai']
+
+
+def random_order(rng, today=None, deadline_days=14):
+    """ Order acak; sebagian ber-deadline hari ini supaya move_to_table_urgent punya kerja """
+    today = today or datetime.date.today()
+    deadline = today + datetime.timedelta(days=rng.randint(0, deadline_days))
+    return {
+        'id_pesanan': f"BENCH-{rng.randrange(10 ** 9):09d}",
+        'id_admin': str(rng.randint(1, 5)),
+        'Platform': rng.choice(PLATFORMS),
+        'qty': rng.randint(1, 50),
+        'Deadline': deadline.strftime('%Y-%m-%d'),
+        'nama_ket': 'benchmark',
+        'link': '',
+    }
+
+
+class OrderPool:
+    """ id_input yang dibuat benchmark; dipakai bersama oleh semua thread """
+
+    def __init__(self, ids=()):
+        self._ids = list(ids)
+        self._lock = threading.Lock()
+
+    def add(self, id_input):
+        with self._lock:
+            self._ids.append(id_input)
+
+    def extend(self, ids):
+        with self._lock:
+            self._ids.extend(ids)
+
+    def pick(self, rng):
+        with self._lock:
+            return rng.choice(self._ids) if self._ids else None
+
+    def take(self, rng):
+        """ Keluarkan satu id (untuk delete) supaya id yang sama tidak dihapus dua kali """
+        with self._lock:
+            if len(self._ids) <= 1:
+                return None
+            index = rng.randrange(len(self._ids))
+            self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+            return self._ids.pop()
+
+    def __len__(self):
+        return len(self._ids)
+
+
+# Operasi: fungsi(client, pool, rng, options) -> (status, detik) atau None jika tidak bisa dijalankan
+
+def op_get_sorted_orders(client, pool, rng, options):
+    path = '/api/get_sorted_orders'
+    if options.get('page_size'):
+        path += f"?limit={options['page_size']}"
+    status, _, elapsed = client.request('GET', path)
+    return status, elapsed
+
+
+def op_input_order(client, pool, rng, options):
+    status, body, elapsed = client.request('POST', '/api/input-order', random_order(rng))
+    if status == 201 and body:
+        pool.add(body['data']['id_input'])
+    return status, elapsed
+
+
+def op_update_design(client, pool, rng, options):
+    id_input = pool.pick(rng)
+    if id_input is None:
+        return None
+    status, _, elapsed = client.request('PUT', '/api/update-design', {
+        'id_input': id_input,
+        'status_print': rng.choice(STATUS_PRINT),
+        'layout_link': f"https://example.invalid/layout/{id_input}",
+    })
+    return status, elapsed
+
+
+def op_sync_prod(client, pool, rng, options):
+    id_input = pool.pick(rng)
+    if id_input is None:
+        return None
+    status, _, elapsed = client.request('PUT', '/api/sync-prod-to-pesanan', {
+        'id_input': id_input,
+        'status_produksi': rng.choice(STATUS_PRODUKSI),
+    })
+    return status, elapsed
+
+
+def op_move_to_table_urgent(client, pool, rng, options):
+    status, _, elapsed = client.request('POST', '/api/move_to_table_urgent')
+    return status, elapsed
+
+
+def op_delete_order(client, pool, rng, options):
+    id_input = pool.take(rng)
+    if id_input is None:
+        return None
+    status, _, elapsed = client.request('DELETE', f"/api/delete-order/{id_input}")
+    return status, elapsed
+
+
+OPERATIONS = {
+    'get_sorted_orders': op_get_sorted_orders,
+    'input_order': op_input_order,
+    'update_design': op_update_design,
+    'sync_prod': op_sync_prod,
+    'move_to_table_urgent': op_move_to_table_urgent,
+    'delete_order': op_delete_order,
+}
+
+
+def seed_orders(client, count, batch_size=500, seed=0):
+    """ Isi database lewat /api/input-order/bulk; mengembalikan list id_input yang dibuat """
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    ids = []
+    while len(ids) < count:
+        size = min(batch_size, count - len(ids))
+        status, body, _ = client.request('POST', '/api/input-order/bulk',
+                                         {'orders': [random_order(rng, today) for _ in range(size)]})
+        if status != 201 or not body:
+            raise RuntimeError(f"Seeding gagal (HTTP {status}): {body}")
+        created = [item['id_input'] for item in body.get('results', []) if item.get('status') == 'success']
+        if not created:
+            raise RuntimeError(f"Seeding tidak membuat order: {body}")
+        ids.extend(created)
+    return ids
@@ -0,0 +1,48 @@
+# Batas id_input per request bulk
+MAX_BULK_UPDATES = 1000
+
+
+def parse_bulk_updates(data, allowed_fields, max_items=MAX_BULK_UPDATES):
+    """
+    Normalisasi body endpoint bulk menjadi {id_input: {kolom: nilai}}.
+    Format yang diterima:
+    - {"id_inputs": [...], "fields": {...}}              -> perubahan yang sama untuk semua id
+    - {"updates": [{"id_input": ..., kolom: nilai}, ...]} -> perubahan per id
+    Hanya kolom di `allowed_fields` dengan nilai bukan None yang dipakai; id_input yang muncul
+    lebih dari sekali digabung (nilai terakhir menang) dan id tanpa kolom valid dibuang.
+    Body yang tidak valid atau tidak menyisakan perubahan menghasilkan ValueError.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Body harus berupa objek JSON")
+    if "updates" in data:
+        updates = data["updates"]
+        if not isinstance(updates, list):
+            raise ValueError("updates harus berupa list")
+    else:
+        id_inputs, fields = data.get("id_inputs"), data.get("fields")
+        if not isinstance(id_inputs, list) or not isinstance(fields, dict):
+            raise ValueError("Body harus berisi updates, atau id_inputs + fields")
+        updates = [dict(fields, id_input=id_input) for id_input in id_inputs]
+
+    merged = {}
+    for item in updates:
+        if not isinstance(item, dict) or not item.get("id_input"):
+            raise ValueError("Setiap update wajib berisi id_input")
+        fields = {k: v for k, v in item.items() if k in allowed_fields and v is not None}
+        if any(isinstance(v, (dict, list)) for v in fields.values()):
+            raise ValueError(f"Nilai tidak valid untuk id_input {item['id_input']}")
+        merged.setdefault(str(item["id_input"]), {}).update(fields)
+    merged = {id_input: fields for id_input, fields in merged.items() if fields}
+    if not merged:
+        raise ValueError("Tidak ada data yang diperbarui")
+    if len(merged) > max_items:
+        raise ValueError(f"Maksimal {max_items} id_input per request")
+    return merged
+
+
+def group_by_fields(updates):
+    """ Kelompokkan id_input yang perubahannya identik -> [(fields, [id_input, ...])], satu statement per kelompok """
+    groups = {}
+    for id_input, fields in updates.items():
+        groups.setdefault(tuple(sorted(fields.items())), []).append(id_input)
+    return [(dict(key), ids) for key, ids in groups.items()]
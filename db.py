@@ -1,11 +1,72 @@
-import mysql.connector
+import os
+import threading
+
+from project_api.db_pool import ConnectionPool
+
+# Bisa diarahkan ke database lain lewat environment (mis. MySQL lokal untuk benchmark)
+DB_CONFIG = {
+    "host": os.environ.get("DB_HOST", "192.168.0.27"),
+    "port": int(os.environ.get("DB_PORT", "3306")),
+    "user": os.environ.get("DB_USER", "root"),
+    "password": os.environ.get("DB_PASSWORD", "/BangZ@ky0029/"),  # Password baru
+    "database": os.environ.get("DB_NAME", "db_mnk"),
+    "autocommit": True,
+}
+
+# Pengaturan pool (bisa diubah lewat configure_pool sebelum koneksi pertama)
+POOL_CONFIG = {
+    "size": 10,             # Jumlah koneksi maksimum per proses
+    "timeout": 5.0,         # Detik menunggu koneksi bebas sebelum PoolTimeout
+    "max_age": 1800,        # Koneksi didaur ulang setelah 30 menit
+    "validate_after": 30.0, # Koneksi yang idle lebih lama dari ini di-ping saat checkout
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Listener instrumentasi yang dipasang ke setiap pool (juga pool yang dibuat ulang configure_pool)
+_pool_listeners = []
+
+
+def configure_pool(**overrides):
+    """ Ubah pengaturan pool; pool lama (jika ada) ditutup dan dibuat ulang saat dipakai """
+    global _pool
+    with _pool_lock:
+        POOL_CONFIG.update(overrides)
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+                for listener in _pool_listeners:
+                    _pool.add_listener(listener)
+    return _pool
+
+
+def add_pool_listener(listener):
+    """ Pasang listener (on_acquire / on_query) ke pool sekarang dan pool berikutnya """
+    with _pool_lock:
+        if listener not in _pool_listeners:
+            _pool_listeners.append(listener)
+        if _pool is not None:
+            _pool.add_listener(listener)
+
+
+def warm_up_pool(count=None):
+    """ Buka koneksi di awal (dipanggil saat startup) """
+    return get_pool().warm_up(count)
+
+
+def get_pool_stats():
+    return get_pool().stats()
+
 
 def get_db_connection():
-    conn = mysql.connector.connect(
-        host="192.168.0.27",
-        user="root",
-        password="/BangZ@ky0029/",  # Password baru
-        database="db_mnk",
-        autocommit=True
-    )
-    return conn
+    """ Pinjam koneksi dari pool; conn.close() mengembalikannya ke pool """
+    return get_pool().get_connection()
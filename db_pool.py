@@ -0,0 +1,345 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(mysql.connector.errors.PoolError):
+    """ Dilempar jika tidak ada koneksi yang bisa dipinjam dalam batas waktu """
+
+
+def notify_query(listeners, operation, params, seconds, cursor):
+    """ Laporkan satu query ke listener pool; listener yang gagal hanya dicatat di log """
+    for listener in listeners:
+        on_query = getattr(listener, 'on_query', None)
+        if on_query is None:
+            continue
+        try:
+            on_query(operation, params, seconds, cursor)
+        except Exception as e:
+            logger.warning(f"⚠️ Listener query gagal: {e}")
+
+
+class InstrumentedCursor:
+    """ Cursor yang melaporkan setiap execute ke listener pool (durasi, rowcount) """
+
+    def __init__(self, cursor, listeners):
+        self._cursor = cursor
+        self._listeners = listeners
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+    def _timed(self, method, operation, params):
+        started = time.perf_counter()
+        try:
+            return method(operation, params)
+        finally:
+            notify_query(self._listeners, operation, params, time.perf_counter() - started, self._cursor)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._timed(lambda op, p: self._cursor.execute(op, p, *args, **kwargs), operation, params)
+
+    def executemany(self, operation, seq_params):
+        return self._timed(self._cursor.executemany, operation, seq_params)
+
+
+class PooledConnection:
+    """ Pembungkus koneksi MySQL: close() mengembalikan koneksi ke pool, bukan menutupnya """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self.created_at = created_at
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise mysql.connector.errors.OperationalError("Koneksi sudah dikembalikan ke pool")
+        return getattr(raw, name)
+
+    def cursor(self, *args, instrument=True, **kwargs):
+        """
+        instrument=False: cursor mentah; pemanggil melaporkan durasinya sendiri lewat
+        report_query (mis. stream unbuffered yang waktunya habis di fetchmany, bukan execute)
+        """
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise mysql.connector.errors.OperationalError("Koneksi sudah dikembalikan ke pool")
+        cursor = raw.cursor(*args, **kwargs)
+        listeners = self._pool.listeners
+        return InstrumentedCursor(cursor, listeners) if listeners and instrument else cursor
+
+    def report_query(self, operation, params, seconds, cursor=None):
+        """ Laporkan query yang dijalankan lewat cursor mentah ke listener pool """
+        notify_query(self._pool.listeners, operation, params, seconds, cursor)
+
+    def is_connected(self):
+        # Tanpa ping: koneksi sudah divalidasi saat checkout, dan handler memanggil ini
+        # hanya untuk memutuskan apakah perlu close()
+        return self._raw is not None
+
+    def close(self):
+        """ Kembalikan koneksi ke pool (aman dipanggil lebih dari sekali) """
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool._release(raw, self.created_at)
+
+    def discard(self):
+        """ Tutup koneksi fisik tanpa mengembalikannya ke pool (mis. state tidak bersih) """
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool._discard(raw)
+
+    def __del__(self):
+        # Jaring pengaman pool: koneksi yang di-GC tanpa close() (handler bocor) tidak boleh
+        # menahan slot selamanya. Koneksi dibuang, bukan dikembalikan, karena state-nya
+        # (transaksi terbuka, hasil belum dibaca) tidak diketahui; counter leaked menandai bug-nya.
+        if self.__dict__.get('_raw') is not None:
+            try:
+                self._pool._note_leak()
+                self.discard()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """ Pool koneksi MySQL dengan validasi saat checkout, umur maksimum, dan counter """
+
+    def __init__(self, db_config, size=10, timeout=5.0, max_age=1800, validate_after=30.0):
+        self.db_config = dict(db_config)
+        self.size = size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.validate_after = validate_after
+
+        # Listener instrumentasi: on_acquire(seconds) dan/atau on_query(operation, params,
+        # seconds, cursor). Tanpa listener, cursor tidak dibungkus sama sekali.
+        self.listeners = []
+
+        self._idle = deque()  # (raw_conn, created_at, returned_at)
+        self._open = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'invalid': 0,
+            'discarded': 0,
+            'leaked': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # API publik
+    # ------------------------------------------------------------------
+    def add_listener(self, listener):
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def get_connection(self, timeout=None):
+        """ Pinjam koneksi dari pool, menunggu sampai `timeout` detik jika pool penuh """
+        if not self.listeners:
+            return self._checkout(timeout)
+        started = time.perf_counter()
+        conn = self._checkout(timeout)
+        elapsed = time.perf_counter() - started
+        for listener in self.listeners:
+            on_acquire = getattr(listener, 'on_acquire', None)
+            if on_acquire is not None:
+                on_acquire(elapsed)
+        return conn
+
+    def _checkout(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+
+        while True:
+            candidate = None
+            with self._cond:
+                while candidate is None:
+                    if self._idle:
+                        candidate = self._idle.pop()
+                    elif self._open < self.size:
+                        self._open += 1
+                        break
+                    else:
+                        if not waited:
+                            waited = True
+                            self._stats['waits'] += 1
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats['timeouts'] += 1
+                            raise PoolTimeout(f"Tidak ada koneksi tersedia dalam {timeout} detik (size={self.size})")
+                        self._cond.wait(remaining)
+
+            if candidate is None:
+                break
+
+            # Validasi di luar lock supaya ping tidak memblokir thread lain
+            raw, created_at, returned_at = candidate
+            if self._usable(raw, created_at, returned_at):
+                with self._cond:
+                    self._stats['checkouts'] += 1
+                return PooledConnection(self, raw, created_at)
+            self._drop(raw)
+
+        # Buka koneksi baru di luar lock agar handshake tidak memblokir thread lain
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['checkouts'] += 1
+        return PooledConnection(self, raw, time.monotonic())
+
+    def warm_up(self, count=None):
+        """ Buka `count` koneksi di awal supaya request pertama tidak menanggung handshake """
+        count = self.size if count is None else min(count, self.size)
+        opened = 0
+        while opened < count:
+            with self._cond:
+                if self._open >= self.size:
+                    break
+                self._open += 1
+            try:
+                raw = self._connect()
+            except mysql.connector.Error as e:
+                with self._cond:
+                    self._open -= 1
+                logger.error(f"❌ Warm-up pool gagal: {e}")
+                break
+            with self._cond:
+                self._idle.appendleft((raw, time.monotonic(), time.monotonic()))
+                self._cond.notify()
+            opened += 1
+        logger.info(f"✅ Pool warm-up: {opened} koneksi dibuka")
+        return opened
+
+    def stats(self):
+        """ Snapshot counter pool """
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+            })
+        return snapshot
+
+    def close_all(self):
+        """ Tutup semua koneksi idle (koneksi yang sedang dipinjam ditutup saat dikembalikan) """
+        with self._cond:
+            idle = [raw for raw, _, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        # Socket ditutup setelah lock dilepas: close yang lambat tidak menahan peminjam
+        for raw in idle:
+            self._close_raw(raw)
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+    def _connect(self):
+        raw = mysql.connector.connect(**self.db_config)
+        with self._cond:
+            self._stats['created'] += 1
+        return raw
+
+    def _usable(self, raw, created_at, returned_at):
+        now = time.monotonic()
+        if self.max_age and now - created_at > self.max_age:
+            with self._cond:
+                self._stats['recycled'] += 1
+            return False
+        if now - returned_at > self.validate_after:
+            try:
+                raw.ping(reconnect=False)
+            except mysql.connector.Error:
+                with self._cond:
+                    self._stats['invalid'] += 1
+                return False
+        return True
+
+    def _drop(self, raw):
+        self._close_raw(raw)
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _release(self, raw, created_at):
+        healthy = True
+        try:
+            if getattr(raw, 'unread_result', False):
+                # Hasil cursor unbuffered belum habis dibaca: peminjam berikutnya akan mendapat
+                # "Unread result found". Membaca sisa hasil bisa mahal, jadi koneksi dibuang.
+                logger.warning("⚠️ Koneksi dikembalikan dengan hasil yang belum dibaca, dibuang")
+                healthy = False
+            elif raw.in_transaction:
+                raw.rollback()
+        except mysql.connector.Error as e:
+            logger.warning(f"⚠️ Koneksi tidak bersih saat dikembalikan, dibuang: {e}")
+            healthy = False
+
+        with self._cond:
+            expired = self.max_age and time.monotonic() - created_at > self.max_age
+            keep = healthy and not expired
+            if keep:
+                self._idle.append((raw, created_at, time.monotonic()))
+            else:
+                if expired:
+                    self._stats['recycled'] += 1
+                else:
+                    self._stats['discarded'] += 1
+                self._open -= 1
+            self._cond.notify()
+        if not keep:
+            # Di luar lock: close yang lambat tidak menahan peminjam lain
+            self._close_raw(raw)
+
+    def _note_leak(self):
+        with self._cond:
+            self._stats['leaked'] += 1
+        logger.warning("⚠️ Koneksi pool di-garbage-collect tanpa close(); koneksi dibuang")
+
+    def _discard(self, raw):
+        with self._cond:
+            self._stats['discarded'] += 1
+        self._drop(raw)
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
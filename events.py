@@ -0,0 +1,75 @@
+import datetime
+import decimal
+import logging
+
+from flask import request
+from flask_socketio import emit, join_room, leave_room
+
+from project_api.my_socket import socketio
+
+logger = logging.getLogger(__name__)
+
+# Room per peran; perubahan sebuah tabel hanya dikirim ke room yang membutuhkannya
+TABLE_ROOMS = {
+    'table_input_order': 'orders',
+    'table_pesanan': 'orders',
+    'table_design': 'design',
+    'table_prod': 'production',
+    'table_urgent': 'urgent',
+}
+ROLES = sorted(set(TABLE_ROOMS.values()))
+
+EVENT_NAME = 'order_change'
+
+
+def change(table, id_input, fields=None, action='update'):
+    """ Satu perubahan ringkas: tabel, id_input, aksi dan field yang berubah """
+    return {'table': table, 'id_input': id_input, 'action': action, 'fields': fields or {}}
+
+
+def _plain(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time, datetime.timedelta)):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return value
+
+
+def publish(changes):
+    """
+    Kirim perubahan ke room terkait. Panggil SETELAH commit berhasil.
+    Kegagalan kirim hanya dicatat: data sudah tersimpan dan klien bisa fallback ke polling.
+    """
+    by_room = {}
+    for item in changes:
+        room = TABLE_ROOMS.get(item['table'])
+        if room is None:
+            continue
+        item = dict(item, fields={k: _plain(v) for k, v in item['fields'].items()})
+        by_room.setdefault(room, []).append(item)
+
+    for room, items in by_room.items():
+        try:
+            socketio.emit(EVENT_NAME, {'changes': items}, to=room)
+        except Exception as e:
+            logger.warning(f"⚠️ Gagal mengirim {EVENT_NAME} ke room {room}: {e}")
+
+
+@socketio.on('join')
+def on_join(data):
+    """ Klien bergabung ke room peran: {"role": "design" | "production" | "urgent" | "orders"} """
+    role = (data or {}).get('role')
+    if role not in ROLES:
+        emit('error', {'message': f"Role tidak dikenal: {role}", 'roles': ROLES})
+        return
+    join_room(role)
+    logger.info(f"✅ Klien {request.sid} bergabung ke room {role}")
+    emit('joined', {'role': role})
+
+
+@socketio.on('leave')
+def on_leave(data):
+    role = (data or {}).get('role')
+    if role in ROLES:
+        leave_room(role)
+        emit('left', {'role': role})
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+
+from flask import Flask, jsonify
+from flask_cors import CORS
+
+logger = logging.getLogger(__name__)
+
+# Nilai default konfigurasi; create_app(config) menimpa sebagian atau semuanya
+DEFAULT_CONFIG = {
+    "LOG_LEVEL": "INFO",
+    "LOG_FORMAT": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    "URGENT_LOG_FILE": "urgent_move.log",   # None: log promosi urgent hanya ke console
+    "CORS_ORIGINS": "*",
+    "SOCKETIO_MESSAGE_QUEUE": None,         # mis. "redis://127.0.0.1:6379/0"; wajib jika worker > 1
+    "DB_POOL": {},                          # Override POOL_CONFIG (size, timeout, ...)
+    "POOL_WARM_UP": True,                   # Buka koneksi di thread latar, tidak menahan startup
+    "SCHEMA_CHECK": True,                   # Verifikasi key/index/foreign key di thread latar
+    "SCHEMA_AUTO_MIGRATE": False,           # True: jalankan migrasi yang belum diterapkan saat startup
+    "SCHEMA_AUX_TABLES": True,              # Buat tabel pendukung (outbox, versi, lease, ...) saat startup
+    "SCHEMA_CACHE_TTL": None,
+    "REFERENCE_CACHE_TTL": None,
+    "METRICS_ENABLED": True,               # /metrics (format Prometheus)
+    "SLOW_QUERY_MS": 200,                   # None: slow-query log nonaktif
+    "SLOW_QUERY_EXPLAIN": True,             # Capture EXPLAIN untuk statement yang lambat
+    "DEBUG_ENDPOINTS": False,               # True: daftarkan /debug/slow-queries (SQL + EXPLAIN, tanpa auth)
+    "START_SCHEDULERS": True,
+    "URGENT_INTERVAL_MINUTES": 15,
+}
+
+_logging_configured = False
+_logging_lock = threading.Lock()
+
+
+def configure_logging(level="INFO", fmt=DEFAULT_CONFIG["LOG_FORMAT"], urgent_log_file=None):
+    """ Pasang handler log sekali per proses (dipanggil ulang oleh create_app tidak menggandakan handler) """
+    global _logging_configured
+    with _logging_lock:
+        if _logging_configured:
+            return
+        logging.basicConfig(level=level, format=fmt)
+        if urgent_log_file:
+            handler = logging.FileHandler(urgent_log_file, delay=True)
+            handler.setFormatter(logging.Formatter(fmt))
+            urgent_logger = logging.getLogger('project_api.routes.POST_table_urgent')
+            urgent_logger.setLevel(logging.DEBUG)
+            urgent_logger.addHandler(handler)
+        _logging_configured = True
+
+
+def create_app(config=None):
+    """
+    Buat aplikasi Flask: logging, CORS, blueprint dan Socket.IO dipasang sekali di sini.
+    Pool koneksi dan cache dibuat saat pertama dipakai; warm-up pool berjalan di latar.
+    Waktu import route dan total startup dicatat di app.config["STARTUP_TIMING"].
+    """
+    started = time.perf_counter()
+    settings = dict(DEFAULT_CONFIG)
+    settings.update(config or {})
+
+    configure_logging(settings["LOG_LEVEL"], settings["LOG_FORMAT"], settings["URGENT_LOG_FILE"])
+
+    app = Flask('project_api')
+    app.config.update(settings)
+    CORS(app, resources={r"/*": {"origins": settings["CORS_ORIGINS"]}})
+
+    from project_api.db import configure_pool, get_pool_stats
+    if settings["DB_POOL"]:
+        configure_pool(**settings["DB_POOL"])
+
+    from project_api.schema_catalog import catalog
+    from project_api.reference_cache import reference_cache
+    if settings["SCHEMA_CACHE_TTL"] is not None:
+        catalog.ttl = settings["SCHEMA_CACHE_TTL"]
+    if settings["REFERENCE_CACHE_TTL"] is not None:
+        reference_cache.ttl = settings["REFERENCE_CACHE_TTL"]
+
+    # Import route (dan handler Socket.IO di events) hanya saat aplikasi benar-benar dibuat
+    imported = time.perf_counter()
+    from project_api.routes import api_bp
+    from project_api.my_socket import socketio
+    import_ms = (time.perf_counter() - imported) * 1000
+
+    @app.route('/')
+    def home():
+        return jsonify({"message": "WebSocket Flask API is running!"}), 200
+
+    # Statistik pool koneksi database
+    @app.route('/api/pool-stats', methods=['GET'])
+    def pool_stats():
+        return jsonify({"status": "success", "data": get_pool_stats()}), 200
+
+    # Waktu startup worker (import route + create_app)
+    @app.route('/api/startup', methods=['GET'])
+    def startup_timing():
+        return jsonify({"status": "success", "data": app.config["STARTUP_TIMING"]}), 200
+
+    app.register_blueprint(api_bp)
+    # Tanpa message queue, events.publish hanya sampai ke klien yang terhubung ke worker ini
+    socketio.init_app(app, message_queue=settings["SOCKETIO_MESSAGE_QUEUE"])
+
+    if settings["METRICS_ENABLED"]:
+        from project_api.metrics import metrics
+        metrics.init_app(app)
+
+    if settings["SLOW_QUERY_MS"] is not None:
+        from project_api.slow_query import slow_query_log
+        slow_query_log.threshold_ms = settings["SLOW_QUERY_MS"]
+        slow_query_log.explain = settings["SLOW_QUERY_EXPLAIN"]
+        slow_query_log.init_app(app, endpoints=settings["DEBUG_ENDPOINTS"])
+
+    if any(settings[key] for key in ("SCHEMA_AUX_TABLES", "POOL_WARM_UP", "SCHEMA_CHECK", "START_SCHEDULERS")):
+        # Request pertama tidak menanggung handshake, tetapi startup juga tidak menunggu DB
+        threading.Thread(target=_background_startup, args=(settings,), name="startup-db", daemon=True).start()
+
+    app.config["STARTUP_TIMING"] = {
+        "import_routes_ms": round(import_ms, 1),
+        "create_app_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"✅ Aplikasi siap dalam {app.config['STARTUP_TIMING']['create_app_ms']} ms "
+                f"(import route {app.config['STARTUP_TIMING']['import_routes_ms']} ms)")
+    return app
+
+
+def _background_startup(settings):
+    """
+    Tabel pendukung dulu (DDL di koneksi sendiri, tidak pernah di transaksi request), lalu
+    scheduler yang membutuhkannya (lease, outbox), warm-up pool, dan verifikasi skema.
+    """
+    from project_api.db import warm_up_pool
+    if settings["SCHEMA_AUX_TABLES"]:
+        from project_api.schema import ensure_aux_tables_on_startup
+        try:
+            ensure_aux_tables_on_startup()
+        except Exception as e:
+            logger.warning(f"⚠️ Gagal membuat tabel pendukung, jalankan `python -m project_api.schema migrate`: {e}")
+    if settings["START_SCHEDULERS"]:
+        from project_api.scheduler import start_urgent_scheduler, start_outbox_compaction
+        start_urgent_scheduler(interval_minutes=settings["URGENT_INTERVAL_MINUTES"])
+        start_outbox_compaction()
+    if settings["POOL_WARM_UP"]:
+        try:
+            warm_up_pool()
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up pool gagal, koneksi dibuka saat dipakai: {e}")
+    if settings["SCHEMA_CHECK"]:
+        from project_api.schema import check_on_startup
+        try:
+            check_on_startup(auto_migrate=settings["SCHEMA_AUTO_MIGRATE"])
+        except Exception as e:
+            logger.warning(f"⚠️ Verifikasi skema gagal: {e}")
@@ -0,0 +1,86 @@
+import logging
+import threading
+
+from project_api.db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Jumlah nomor yang dipesan sekaligus oleh tiap worker untuk dibagikan dari memori
+BLOCK_SIZE = 20
+
+
+
+class IdAllocator:
+    """
+    Alokasi id_input MMYY-NNNNN tanpa scan LIKE/ORDER BY.
+    Nomor diambil dengan increment atomik pada baris counter per bulan
+    (UPDATE ... LAST_INSERT_ID(last_value + n)) di koneksi autocommit tersendiri, sehingga
+    lock baris counter hanya ditahan selama satu statement. Tiap worker memesan blok
+    nomor dan membagikannya dari memori; nomor yang tidak terpakai saat worker berhenti
+    hilang (id unik, tetapi tidak dijamin tanpa celah).
+    """
+
+    def __init__(self, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        self._blocks = {}  # period -> [nomor berikutnya, nomor terakhir di blok]
+        self._lock = threading.Lock()
+
+    def _increment(self, cursor, period, count):
+        cursor.execute(
+            "UPDATE table_id_counter SET last_value = LAST_INSERT_ID(last_value + %s) WHERE period = %s",
+            (count, period)
+        )
+        if cursor.rowcount == 0:
+            return None
+        if cursor.lastrowid:
+            return cursor.lastrowid
+        cursor.execute("SELECT LAST_INSERT_ID()")
+        return cursor.fetchone()[0]
+
+    def reserve(self, period, count):
+        """ Pesan `count` nomor berurutan untuk `period`; mengembalikan nomor pertama """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            last = self._increment(cursor, period, count)
+            if last is None:
+                # Pertama kali di bulan ini: mulai dari id_input terbesar yang sudah ada
+                cursor.execute("""
+                    INSERT IGNORE INTO table_id_counter (period, last_value)
+                    SELECT %s, COALESCE(MAX(CAST(SUBSTRING(id_input, 6) AS UNSIGNED)), 0)
+                    FROM table_input_order WHERE id_input LIKE %s
+                """, (period, f"{period}-%"))
+                last = self._increment(cursor, period, count)
+            return last - count + 1
+        finally:
+            cursor.close()
+            conn.close()
+
+    def next_number(self, period):
+        """ Nomor berikutnya dari blok di memori; blok baru dipesan jika habis """
+        with self._lock:
+            block = self._blocks.get(period)
+            if block is None or block[0] > block[1]:
+                first = self.reserve(period, self.block_size)
+                block = [first, first + self.block_size - 1]
+                # Blok bulan lain tidak akan dipakai lagi
+                self._blocks = {period: block}
+            number = block[0]
+            block[0] += 1
+            return number
+
+    def next_id(self, period):
+        return format_id(period, self.next_number(period))
+
+    def allocate_block(self, period, count):
+        """ `count` id_input berurutan langsung dari counter (untuk import bulk) """
+        first = self.reserve(period, count)
+        return [format_id(period, first + offset) for offset in range(count)]
+
+
+def format_id(period, number):
+    return f"{period}-{str(number).zfill(5)}"
+
+
+# Instance bersama untuk seluruh aplikasi
+allocator = IdAllocator()
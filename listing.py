@@ -0,0 +1,128 @@
+import base64
+import binascii
+import json
+
+from project_api.schema_catalog import catalog
+
+# Batas ukuran halaman untuk endpoint list
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class ListingError(ValueError):
+    """ Parameter list tidak valid (dijawab dengan 400) """
+
+
+def encode_cursor(values):
+    """ Token cursor opaque dari nilai keyset baris terakhir """
+    raw = json.dumps(list(values), default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, size):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ListingError('Parameter after tidak valid')
+    if not isinstance(values, list) or len(values) != size:
+        raise ListingError('Parameter after tidak valid')
+    return values
+
+
+def parse_page_args(args, keyset):
+    """
+    Baca `limit` dan `after` dari query string.
+    Mengembalikan None jika keduanya tidak ada (perilaku lama: seluruh tabel),
+    atau (limit, after_values) untuk mode pagination.
+    """
+    limit = args.get('limit')
+    after = args.get('after')
+    if limit is None and after is None:
+        return None
+
+    if limit is None:
+        limit = DEFAULT_LIMIT
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ListingError('Parameter limit harus berupa angka')
+        if limit < 1:
+            raise ListingError('Parameter limit minimal 1')
+        limit = min(limit, MAX_LIMIT)
+
+    after_values = decode_cursor(after, len(keyset)) if after else None
+    return limit, after_values
+
+
+def parse_fields(args, table, keyset=(), cursor=None):
+    """
+    Proyeksi kolom dari ?fields=a,b,c, divalidasi terhadap kolom asli `table`.
+    Mengembalikan daftar SELECT (`a`, `b`, ...) atau '*' jika tidak diminta.
+    Kolom keyset selalu ikut supaya next_cursor tetap bisa dibuat.
+    """
+    raw = args.get('fields')
+    if not raw:
+        return '*'
+
+    fields = []
+    for name in raw.split(','):
+        name = name.strip()
+        if name and name not in fields:
+            fields.append(name)
+    if not fields:
+        return '*'
+
+    invalid = catalog.invalid_columns(table, fields, cursor)
+    if invalid:
+        raise ListingError(f"Kolom tidak valid di {table}: {', '.join(invalid)}")
+
+    for col in keyset:
+        if col not in fields:
+            fields.append(col)
+    return ', '.join(f"`{name}`" for name in fields)
+
+
+def keyset_clause(keyset, after_values, alias=''):
+    """
+    Kondisi WHERE "setelah baris terakhir" untuk keyset (kolom, ...) yang diurutkan ASC.
+    Kolom pertama dari keyset dua kolom boleh NULL (MySQL mengurutkan NULL paling awal).
+    """
+    prefix = f"{alias}." if alias else ''
+    if len(keyset) == 1:
+        return f"{prefix}{keyset[0]} > %s", [after_values[0]]
+
+    first, second = keyset
+    last_first, last_second = after_values
+    if last_first is None:
+        return (f"(({prefix}{first} IS NULL AND {prefix}{second} > %s) OR {prefix}{first} IS NOT NULL)",
+                [last_second])
+    return (f"({prefix}{first} > %s OR ({prefix}{first} = %s AND {prefix}{second} > %s))",
+            [last_first, last_first, last_second])
+
+
+def order_clause(keyset, alias=''):
+    prefix = f"{alias}." if alias else ''
+    return ', '.join(f"{prefix}{col} ASC" for col in keyset)
+
+
+def page_query(table, keyset, limit, after_values, select='*'):
+    """ SELECT satu halaman `table` berdasarkan keyset """
+    params = []
+    where = ''
+    if after_values is not None:
+        condition, params = keyset_clause(keyset, after_values)
+        where = f" WHERE {condition}"
+    query = f"SELECT {select} FROM {table}{where} ORDER BY {order_clause(keyset)} LIMIT %s"
+    # Ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya
+    return query, params + [limit + 1]
+
+
+def split_page(rows, keyset, limit):
+    """ Potong baris ekstra dan buat token next_cursor (None jika halaman terakhir) """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last[col] for col in keyset)
@@ -0,0 +1,178 @@
+import bisect
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+
+from project_api.db import add_pool_listener, get_pool_stats
+
+# Batas bucket histogram (detik / byte)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+ACQUIRE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Statistik pool yang berupa keadaan saat ini (checkouts, waits, ... adalah counter)
+POOL_GAUGES = ('size', 'open', 'idle', 'in_use')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(names, values, extra=''):
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    """ Histogram kumulatif format Prometheus; observe() hanya satu bisect + increment """
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._series = {}  # labels -> [counts per bucket (+Inf terakhir), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_number(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """
+    Metrik per endpoint untuk semua blueprint: latency, jumlah & waktu query DB per request,
+    waktu pinjam koneksi, dan ukuran response. Dipasang sebagai listener pool (cursor
+    terinstrumentasi) plus hook before/after_request; dilayani di /metrics.
+    """
+
+    ENDPOINT_LABELS = ('method', 'endpoint', 'status')
+
+    def __init__(self):
+        self.requests = Counter(
+            'http_requests_total', 'Jumlah request HTTP', self.ENDPOINT_LABELS)
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Latency request HTTP', LATENCY_BUCKETS, self.ENDPOINT_LABELS)
+        self.response_size = Histogram(
+            'http_response_size_bytes', 'Ukuran body response (tanpa response stream)',
+            SIZE_BUCKETS, ('method', 'endpoint'))
+        self.db_queries = Histogram(
+            'db_queries_per_request', 'Jumlah query DB per request', QUERY_COUNT_BUCKETS, ('method', 'endpoint'))
+        self.db_time = Histogram(
+            'db_time_per_request_seconds', 'Total waktu query DB per request', DB_TIME_BUCKETS,
+            ('method', 'endpoint'))
+        self.db_query_duration = Histogram(
+            'db_query_duration_seconds', 'Durasi tiap query DB (termasuk job latar)', DB_TIME_BUCKETS)
+        self.acquire = Histogram(
+            'db_pool_acquire_seconds', 'Waktu menunggu koneksi dari pool', ACQUIRE_BUCKETS)
+        self._collectors = [self.requests, self.latency, self.response_size, self.db_queries,
+                            self.db_time, self.db_query_duration, self.acquire]
+
+    # Listener pool ------------------------------------------------------
+    def on_acquire(self, seconds):
+        self.acquire.observe(seconds)
+
+    def on_query(self, operation, params, seconds, cursor):
+        self.db_query_duration.observe(seconds)
+        if has_request_context():
+            g._metrics_db_queries = g.get('_metrics_db_queries', 0) + 1
+            g._metrics_db_time = g.get('_metrics_db_time', 0.0) + seconds
+
+    # Hook Flask ---------------------------------------------------------
+    def _before_request(self):
+        g._metrics_started = time.perf_counter()
+
+    def _after_request(self, response):
+        started = g.get('_metrics_started')
+        if started is None or request.path == '/metrics':
+            return response
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        method = request.method
+        self.requests.inc((method, endpoint, str(response.status_code)))
+        self.latency.observe(time.perf_counter() - started, (method, endpoint, str(response.status_code)))
+        self.db_queries.observe(g.get('_metrics_db_queries', 0), (method, endpoint))
+        self.db_time.observe(g.get('_metrics_db_time', 0.0), (method, endpoint))
+        if not response.is_streamed:
+            self.response_size.observe(response.calculate_content_length() or 0, (method, endpoint))
+        return response
+
+    def render(self, pool_stats=None):
+        lines = []
+        for collector in self._collectors:
+            lines.extend(collector.render())
+        for key, value in sorted((pool_stats or {}).items()):
+            # Keadaan pool saat ini sebagai gauge; sisanya counter kumulatif sejak pool dibuat
+            if key in POOL_GAUGES:
+                name, kind = f"db_pool_{key}", 'gauge'
+            else:
+                name, kind = f"db_pool_{key}_total", 'counter'
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def init_app(self, app):
+        add_pool_listener(self)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+        @app.route('/metrics', methods=['GET'])
+        def prometheus_metrics():
+            return Response(self.render(get_pool_stats()), mimetype=CONTENT_TYPE)
+
+
+# Instance bersama untuk seluruh aplikasi
+metrics = Metrics()
@@ -1,3 +1,5 @@
 from flask_socketio import SocketIO
 
+# Satu instance per proses. Dengan lebih dari satu worker (gunicorn), set SOCKETIO_MESSAGE_QUEUE
+# (mis. Redis) di config create_app supaya emit dari satu worker sampai ke klien di worker lain.
 socketio = SocketIO(cors_allowed_origins="*")  # ✅ Pisahkan socket dari app.py
@@ -0,0 +1,111 @@
+import json
+import logging
+
+from project_api.versioning import bump
+
+logger = logging.getLogger(__name__)
+
+# Entri outbox lebih tua dari ini dihapus oleh job compaction
+RETENTION_HOURS = 72
+COMPACT_BATCH = 5000
+
+# Umur minimal entri di belakang celah seq sebelum celah itu dianggap rollback (lihat read_since)
+VISIBILITY_LAG_SECONDS = 5
+
+def record(cursor, changes):
+    """ Tulis `changes` ke outbox dengan satu INSERT multi-row (di transaksi pemanggil) """
+    if not changes:
+        return
+    values = []
+    for item in changes:
+        values.extend([
+            item['table'],
+            item['id_input'],
+            item['action'],
+            json.dumps(item['fields'], default=str) if item['fields'] else None,
+        ])
+    cursor.execute(
+        "INSERT INTO table_outbox (table_name, id_input, action, fields) VALUES "
+        + ', '.join(['(%s, %s, %s, %s)'] * len(changes)),
+        values
+    )
+
+
+def stage(cursor, changes):
+    """
+    Catat perubahan sebelum commit: entri outbox + versi tabel (ETag).
+    Setelah commit, kirim `changes` yang sama lewat events.publish.
+    """
+    record(cursor, changes)
+    bump(cursor, *dict.fromkeys(item['table'] for item in changes))
+
+
+def _value(row, key, index):
+    return row[key] if isinstance(row, dict) else row[index]
+
+
+def read_since(cursor, since, limit, lag_seconds=VISIBILITY_LAG_SECONDS):
+    """
+    Entri dengan seq > since, urut seq; cursor harus cursor dictionary.
+    seq AUTO_INCREMENT dibagikan saat INSERT, bukan saat commit: transaksi dengan seq lebih kecil
+    bisa commit belakangan. Karena itu hanya prefix yang aman yang dikembalikan: berhenti di celah
+    seq pertama yang entri sesudahnya belum berumur `lag_seconds` (celah yang lebih tua dianggap
+    rollback). stage() dipanggil tepat sebelum commit, jadi jendela ini cukup pendek.
+    """
+    cursor.execute("""
+        SELECT seq, table_name, id_input, action, fields, created_at,
+               created_at < NOW() - INTERVAL %s SECOND AS settled
+        FROM table_outbox WHERE seq > %s ORDER BY seq LIMIT %s
+    """, (lag_seconds, since, limit))
+    entries = []
+    expected = since + 1
+    for entry in cursor.fetchall():
+        settled = entry.pop('settled')
+        if entry['seq'] != expected and not settled:
+            break
+        entry['fields'] = json.loads(entry['fields']) if entry['fields'] else {}
+        entries.append(entry)
+        expected = entry['seq'] + 1
+    return entries
+
+
+def bounds(cursor):
+    """
+    (compacted_seq, min_seq, max_seq): seq terakhir yang sudah dihapus compaction (0 jika belum
+    pernah), serta seq tertua dan terbaru yang masih tersimpan (None jika outbox kosong)
+    """
+    cursor.execute("""
+        SELECT (SELECT COALESCE(MAX(compacted_seq), 0) FROM table_outbox_state) AS compacted_seq,
+               MIN(seq) AS min_seq, MAX(seq) AS max_seq
+        FROM table_outbox
+    """)
+    row = cursor.fetchone()
+    return _value(row, 'compacted_seq', 0), _value(row, 'min_seq', 1), _value(row, 'max_seq', 2)
+
+
+def compact(cursor, retention_hours=RETENTION_HOURS, batch=COMPACT_BATCH):
+    """
+    Hapus entri lebih tua dari `retention_hours` per batch agar lock tetap pendek.
+    Batas seq yang dihapus dicatat lebih dulu di table_outbox_state; /api/changes memakainya
+    untuk menjawab 410 hanya jika entri setelah `since` memang sudah dihapus.
+    """
+    deleted = 0
+    while True:
+        cursor.execute("""
+            SELECT MAX(seq) AS boundary FROM (
+                SELECT seq FROM table_outbox
+                WHERE created_at < NOW() - INTERVAL %s HOUR ORDER BY seq LIMIT %s
+            ) AS expired
+        """, (retention_hours, batch))
+        boundary = _value(cursor.fetchone(), 'boundary', 0)
+        if boundary is None:
+            break
+        cursor.execute("""
+            INSERT INTO table_outbox_state (id, compacted_seq) VALUES (1, %s)
+            ON DUPLICATE KEY UPDATE compacted_seq = GREATEST(compacted_seq, VALUES(compacted_seq))
+        """, (boundary,))
+        cursor.execute("DELETE FROM table_outbox WHERE seq <= %s", (boundary,))
+        deleted += cursor.rowcount
+        if cursor.rowcount < batch:
+            break
+    return deleted
@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+
+from project_api.db import get_db_connection
+from project_api.schema import STAFF_TABLES
+from project_api.versioning import bump, get_versions
+
+logger = logging.getLogger(__name__)
+
+# Baris table_versions yang menjadi sinyal invalidate bersama untuk semua worker
+VERSION_KEY = 'reference_staff'
+# Seberapa sering (detik) worker membandingkan versinya dengan table_versions
+VERSION_CHECK_INTERVAL = 5
+
+
+class ReferenceCache:
+    """
+    Cache daftar staf (ID, Nama) dari semua tabel staf.
+    Dimuat dengan satu query UNION ALL, dilayani dari memori sampai TTL habis
+    atau invalidate() dipanggil. Cache ada per proses: invalidate() juga menaikkan versi
+    VERSION_KEY di table_versions, dan worker lain memuat ulang paling lambat
+    `version_check_interval` detik kemudian (satu lookup primary key per interval).
+    """
+
+    def __init__(self, tables=STAFF_TABLES, ttl=300, version_check_interval=VERSION_CHECK_INTERVAL):
+        self.tables = list(tables)
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._data = None
+        self._loaded_at = None
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _expired(self):
+        return self._data is None or (self.ttl and time.monotonic() - self._loaded_at > self.ttl)
+
+    def _load(self):
+        query = " UNION ALL ".join(
+            f"SELECT '{table}' AS source, ID, Nama FROM `{table}`" for table in self.tables
+        )
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            # Versi dibaca sebelum data: invalidate di antaranya tetap terdeteksi pada cek berikutnya
+            version = self._read_version(cursor)
+            cursor.execute(query)
+            rows = cursor.fetchall()
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+        data = {table: [] for table in self.tables}
+        for row in rows:
+            data[row['source']].append({'ID': row['ID'], 'Nama': row['Nama']})
+        self._data = data
+        self._loaded_at = self._checked_at = time.monotonic()
+        self._version = version
+        logger.info(f"✅ Data referensi dimuat: {len(rows)} staf dari {len(self.tables)} tabel")
+
+    @staticmethod
+    def _read_version(cursor):
+        return get_versions(cursor, [VERSION_KEY])[VERSION_KEY]
+
+    def _check_version(self):
+        """ Buang cache jika worker lain sudah invalidate (versi di table_versions berubah) """
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            version = self._read_version(cursor)
+        except Exception as e:
+            logger.warning(f"⚠️ Gagal membaca versi data referensi: {e}")
+            return
+        finally:
+            self._checked_at = time.monotonic()
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+        if version != self._version:
+            self._data = None
+
+    def _version_stale(self):
+        return (self._data is not None and self.version_check_interval is not None
+                and time.monotonic() - self._checked_at > self.version_check_interval)
+
+    def get(self):
+        """ {nama_tabel: [{"ID": ..., "Nama": ...}, ...]} """
+        if self._version_stale():
+            with self._lock:
+                if self._version_stale():
+                    self._check_version()
+        if self._expired():
+            with self._lock:
+                if self._expired():
+                    try:
+                        self._load()
+                    except Exception as e:
+                        if self._data is None:
+                            raise
+                        # DB bermasalah: tetap layani data lama daripada gagal
+                        logger.error(f"❌ Gagal memuat ulang data referensi, memakai cache lama: {e}")
+                        self._loaded_at = time.monotonic()
+        return self._data
+
+    def invalidate(self):
+        """ Paksa reload di worker ini sekarang, dan di worker lain lewat versi bersama """
+        with self._lock:
+            self._data = None
+            self._loaded_at = None
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            bump(cursor, VERSION_KEY)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def refresh(self):
+        with self._lock:
+            self._load()
+        return self._data
+
+
+# Instance bersama untuk seluruh aplikasi
+reference_cache = ReferenceCache()
@@ -1,14 +1,11 @@
-from flask import Flask, Blueprint, request, jsonify
-from flask_cors import CORS
+from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
+from project_api import outbox
+from project_api import events
 import logging  # ✅ Tetap digunakan
 
-app = Flask(__name__)
 delete_order_bp = Blueprint('delete', __name__)
-CORS(delete_order_bp)
 
-# 🔹 Konfigurasi logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -34,13 +31,18 @@ def delete_order(id_input):
         # Mulai transaksi
         conn.start_transaction()
 
-        # Hapus dari semua tabel yang berhubungan (termasuk table_urgent)
-        tables_to_delete = ["table_input_order", "table_pesanan", "table_prod", "table_urgent"]  
+        # Hapus dari semua tabel yang berhubungan, tabel anak dulu. table_design ikut disebut
+        # walaupun foreign key ON DELETE CASCADE juga menghapusnya: versi (ETag) dan event
+        # delete-nya harus tetap tercatat.
+        tables_to_delete = ["table_urgent", "table_prod", "table_design", "table_pesanan", "table_input_order"]
         for table in tables_to_delete:
             cursor.execute(f"DELETE FROM {table} WHERE id_input = %s", (id_input,))
+        changes = [events.change(table, id_input, action='delete') for table in tables_to_delete]
+        outbox.stage(cursor, changes)
 
         # Commit transaksi jika tidak ada error
         conn.commit()
+        events.publish(changes)
 
         return jsonify({'status': 'success', 'message': f'Data dengan id_input {id_input} berhasil dihapus dari semua tabel'}), 200
 
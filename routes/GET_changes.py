@@ -0,0 +1,102 @@
+from flask import Blueprint, request, jsonify
+from project_api.db import get_db_connection
+from project_api.listing import DEFAULT_LIMIT, ListingError, parse_page_args
+from project_api import events, outbox
+import logging
+
+changes_bp = Blueprint('changes', __name__)
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_current_rows(cursor, entries):
+    """
+    Baris terkini untuk entri `entries`: satu query IN per tabel, id_input duplikat digabung.
+    Mengembalikan {table: {id_input: row}}; baris yang sudah dihapus tidak ada di hasil.
+    """
+    ids_by_table = {}
+    for entry in entries:
+        table = entry['table_name']
+        if entry['id_input'] is None or table not in events.TABLE_ROOMS:
+            continue
+        ids_by_table.setdefault(table, {})[entry['id_input']] = None
+
+    rows = {}
+    for table, ids in ids_by_table.items():
+        ids = list(ids)
+        cursor.execute(
+            f"SELECT * FROM {table} WHERE id_input IN ({', '.join(['%s'] * len(ids))})",
+            ids
+        )
+        rows[table] = {row['id_input']: row for row in cursor.fetchall()}
+    return rows
+
+
+# GET: Feed perubahan sejak seq tertentu (polling murah pengganti reload seluruh tabel)
+@changes_bp.route('/api/changes', methods=['GET'])
+def get_changes():
+    """
+    ?since=<seq>  : ambil entri outbox dengan seq > since (default 0)
+    ?limit=<n>    : jumlah entri maksimal per halaman
+    ?rows=1       : sertakan baris terkini dari tiap (tabel, id_input) yang berubah
+    Klien menyimpan next_since dan memakainya di request berikutnya. Entri yang baru masuk di
+    belakang celah seq ditahan sebentar (lihat outbox.read_since), jadi next_since tidak pernah
+    melompati transaksi yang belum commit. 410 berarti entri setelah `since` sudah di-compact:
+    muat ulang data lengkap lalu lanjut dari latest_seq.
+    """
+    conn = None
+    cursor = None
+    try:
+        try:
+            since = int(request.args.get('since', 0))
+        except ValueError:
+            raise ListingError('Parameter since harus berupa angka')
+        if since < 0:
+            raise ListingError('Parameter since minimal 0')
+        page = parse_page_args(request.args, ())
+        limit = page[0] if page else DEFAULT_LIMIT
+
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        compacted, oldest, latest = outbox.bounds(cursor)
+        if since < compacted:
+            return jsonify({
+                'status': 'error',
+                'message': 'Riwayat perubahan sudah tidak tersedia, muat ulang data',
+                'min_seq': oldest,
+                'latest_seq': latest,
+            }), 410
+
+        entries = outbox.read_since(cursor, since, limit + 1)
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        body = {
+            'changes': [{
+                'seq': entry['seq'],
+                'table': entry['table_name'],
+                'id_input': entry['id_input'],
+                'action': entry['action'],
+                'fields': entry['fields'],
+                'created_at': entry['created_at'],
+            } for entry in entries],
+            'next_since': entries[-1]['seq'] if entries else since,
+            'min_seq': oldest,
+            'latest_seq': latest,
+            'has_more': has_more,
+        }
+        if request.args.get('rows') in ('1', 'true'):
+            body['rows'] = fetch_current_rows(cursor, entries)
+        return jsonify(body), 200
+
+    except ListingError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"❌ Error get_changes: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
@@ -0,0 +1,164 @@
+from flask import Blueprint, request, jsonify
+from project_api.db import get_db_connection
+from project_api.schema_catalog import catalog
+from project_api.listing import ListingError, parse_page_args, keyset_clause, order_clause, split_page
+from project_api.streaming import wants_stream, stream_query
+from project_api.versioning import versioned
+import logging
+
+order_board_bp = Blueprint('order_board', __name__)
+
+logger = logging.getLogger(__name__)
+
+# Bagian papan order -> (tabel, alias); table_pesanan menjadi basis, sisanya LEFT JOIN per id_input
+BOARD_SECTIONS = {
+    'pesanan': ('table_pesanan', 'p'),
+    'design': ('table_design', 'd'),
+    'prod': ('table_prod', 'pr'),
+    'urgent': ('table_urgent', 'u'),
+}
+BOARD_TABLES = tuple(table for table, _ in BOARD_SECTIONS.values())
+
+# Urutan papan sama dengan /api/get_sorted_orders: deadline terdekat dulu
+BOARD_KEYSET = ('deadline', 'id_input')
+
+# Filter server-side: parameter query string -> kondisi SQL
+BOARD_FILTERS = {
+    'platform': "p.platform = %s",
+    'status_print': "p.status_print = %s",
+    'status_produksi': "p.status_produksi = %s",
+    'id_desainer': "p.id_desainer = %s",
+    'id_admin': "p.id_admin = %s",
+    'deadline_from': "p.deadline >= %s",
+    'deadline_to': "p.deadline <= %s",
+}
+
+
+def board_columns(args, cursor=None):
+    """
+    Kolom per bagian untuk SELECT. Tanpa ?fields= semua kolom tiap tabel (dari schema catalog);
+    dengan ?fields=pesanan.qty,design.layout_link hanya kolom itu (divalidasi per tabel).
+    """
+    raw = args.get('fields')
+    if not raw:
+        return {section: catalog.columns(table, cursor) for section, (table, _) in BOARD_SECTIONS.items()}
+
+    selected = {}
+    for name in raw.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        section, _, column = name.partition('.')
+        if section not in BOARD_SECTIONS or not column:
+            raise ListingError(f"Field tidak valid: {name} (gunakan <bagian>.<kolom>, bagian: "
+                               f"{', '.join(BOARD_SECTIONS)})")
+        columns = selected.setdefault(section, [])
+        if column not in columns:
+            columns.append(column)
+
+    for section, columns in selected.items():
+        table = BOARD_SECTIONS[section][0]
+        invalid = catalog.invalid_columns(table, columns, cursor)
+        if invalid:
+            raise ListingError(f"Kolom tidak valid di {table}: {', '.join(invalid)}")
+    return selected
+
+
+def board_query(args, page, cursor=None):
+    """ Satu query JOIN ber-index id_input untuk seluruh papan (atau satu halaman) """
+    columns = board_columns(args, cursor)
+    select = ["p.id_input AS `id_input`", "p.deadline AS `deadline`"]
+    for section, names in columns.items():
+        alias = BOARD_SECTIONS[section][1]
+        # id_input tiap bagian ikut diambil untuk membedakan "tidak ada baris" dari kolom NULL
+        for name in dict.fromkeys(['id_input'] + list(names)):
+            select.append(f"{alias}.`{name}` AS `{section}__{name}`")
+
+    joins = [f"LEFT JOIN {table} {alias} ON {alias}.id_input = p.id_input"
+             for section, (table, alias) in BOARD_SECTIONS.items() if section != 'pesanan']
+
+    conditions = []
+    params = []
+    for arg, condition in BOARD_FILTERS.items():
+        value = args.get(arg)
+        if value:
+            conditions.append(condition)
+            params.append(value)
+    if args.get('urgent') in ('1', 'true'):
+        conditions.append("u.id_input IS NOT NULL")
+
+    if page is not None:
+        after_values = page[1]
+        if after_values is not None:
+            condition, after_params = keyset_clause(BOARD_KEYSET, after_values, alias='p')
+            conditions.append(condition)
+            params.extend(after_params)
+
+    query = f"SELECT {', '.join(select)} FROM table_pesanan p {' '.join(joins)}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {order_clause(BOARD_KEYSET, alias='p')}"
+    if page is not None:
+        query += " LIMIT %s"
+        params.append(page[0] + 1)
+    return query, params
+
+
+def nest_row(row):
+    """ Baris datar `bagian__kolom` -> {id_input, deadline, pesanan: {...}, design: {...} | None, ...} """
+    board = {'id_input': row['id_input'], 'deadline': row['deadline']}
+    for key, value in row.items():
+        section, sep, column = key.partition('__')
+        if sep:
+            board.setdefault(section, {})[column] = value
+    for section in BOARD_SECTIONS:
+        if section in board and board[section].get('id_input') is None:
+            board[section] = None
+    if hasattr(board['deadline'], 'strftime'):
+        board['deadline'] = board['deadline'].strftime("%Y-%m-%d")
+    return board
+
+
+# GET: Papan order gabungan pesanan + design + prod + urgent dalam satu request
+@order_board_bp.route('/api/order-board', methods=['GET'])
+@versioned(*BOARD_TABLES)
+def get_order_board():
+    """
+    Pengganti empat request list (get-orders, get_table_design, get_table_prod, get_table_urgent)
+    yang sebelumnya digabung di browser. Mendukung filter BOARD_FILTERS + ?urgent=1,
+    pagination limit/after, ?fields=<bagian>.<kolom> dan ?stream=json|ndjson.
+    """
+    conn = None
+    cursor = None
+    try:
+        page = parse_page_args(request.args, BOARD_KEYSET)
+        fmt = wants_stream(request.args)
+        if fmt is not None:
+            if page is not None:
+                raise ListingError('Parameter stream tidak bisa digabung dengan limit/after')
+            query, params = board_query(request.args, None)
+            return stream_query(query, params, fmt, key='data', envelope={'status': 'success'},
+                                transform=nest_row)
+
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        query, params = board_query(request.args, page, cursor)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+        body = {'status': 'success'}
+        if page is not None:
+            rows, body['next_cursor'] = split_page(rows, BOARD_KEYSET, page[0])
+        body['data'] = [nest_row(row) for row in rows]
+        return jsonify(body), 200
+
+    except ListingError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        logger.error(f"❌ Error get_order_board: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
@@ -1,78 +1,139 @@
-from flask import Flask, Blueprint, request, jsonify
-from flask_cors import CORS
+from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
+from project_api.schema_catalog import catalog
+from project_api.listing import ListingError, parse_page_args, parse_fields, page_query, split_page
+from project_api.streaming import wants_stream, stream_query
+from project_api.versioning import versioned
+from project_api.reference_cache import reference_cache
+from project_api import events, outbox, sync_engine
 from mysql.connector import Error
 from datetime import datetime
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('order_sync')
 
-app = Flask(__name__)
 orders_bp = Blueprint('orders', __name__)
-CORS(orders_bp)
-
-# Reference data for names
-reference_data = {
-    "table_admin": [
-        {"ID": 1001, "nama": "Lilis"},
-        {"ID": 1002, "nama": "Ina"}
-    ],
-    "table_desainer": [
-        {"ID": 1101, "nama": "IMAM"},
-        {"ID": 1102, "nama": "JHODI"}
-    ],
-    "table_kurir": [
-        {"ID": 1501, "nama": "teddy"},
-        {"ID": 1502, "nama": "Mas Nur"},
-        {"ID": 1503, "nama": "Jhodi"}
-    ],
-    "table_penjahit": [
-        {"ID": 1301, "nama": "Mas Ari"},
-        {"ID": 1302, "nama": "Mas Saep"},
-        {"ID": 1303, "nama": "Mas Egeng"},
-        {"ID": 1304, "nama": "Maman"},
-        {"ID": 1305, "nama": "Mas Uu"}
-    ],
-    "table_qc": [
-        {"ID": 1401, "nama": "tita"},
-        {"ID": 1402, "nama": "ina"},
-        {"ID": 1403, "nama": "lilis"}
-    ]
-}
 
-# GET: Ambil Data reference 
+# GET: Ambil Data reference (dari cache data referensi, bukan salinan hard-coded)
 @orders_bp.route("/api/references", methods=["GET"])
 def get_references():
-    return jsonify(reference_data)
+    try:
+        data = reference_cache.get()
+    except Error as e:
+        logger.error(f"Error getting references: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return jsonify({
+        table: [{"ID": row["ID"], "nama": row["Nama"]} for row in rows]
+        for table, rows in data.items()
+    })
+
+# POST: Kosongkan cache data referensi (panggil setelah mengubah tabel staf).
+# Worker ini langsung memuat ulang; worker lain menyusul lewat versi di table_versions.
+@orders_bp.route("/api/references/invalidate", methods=["POST"])
+def invalidate_references():
+    try:
+        reference_cache.invalidate()
+    except Error as e:
+        logger.error(f"Error invalidating references: {str(e)}")
+        return jsonify({'status': 'error', 'message': f'Cache worker ini dikosongkan, tetapi sinyal ke worker lain gagal: {e}'}), 500
+    return jsonify({
+        'status': 'success',
+        'message': 'Cache data referensi dikosongkan',
+        'other_workers_refresh_within_s': reference_cache.version_check_interval,
+    }), 200
+
+# Keyset untuk pagination tiap endpoint list
+DEADLINE_KEYSET = ('deadline', 'id_input')
+ID_KEYSET = ('id_input',)
+
+def listing_query(table, keyset, unpaginated_order, page, select='*'):
+    if page is None:
+        order = f" ORDER BY {unpaginated_order}" if unpaginated_order else ''
+        return f"SELECT {select} FROM {table}{order}", []
+    limit, after_values = page
+    return page_query(table, keyset, limit, after_values, select)
+
+def fetch_listing(table, keyset, unpaginated_order=''):
+    """
+    Ambil data list dari `table`.
+    Tanpa `limit`/`after` di query string: seluruh tabel (perilaku lama, next_cursor None).
+    Dengan `limit`/`after`: satu halaman berdasarkan keyset + token next_cursor.
+    `fields` membatasi kolom yang diambil.
+    Mengembalikan (rows, next_cursor, paginated).
+    """
+    page = parse_page_args(request.args, keyset)
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        # Proyeksi ?fields= didorong ke SELECT (kolom keyset ikut saat pagination)
+        select = parse_fields(request.args, table, keyset if page else (), cursor)
+        query, params = listing_query(table, keyset, unpaginated_order, page, select)
+        cursor.execute(query, params)
+        if page is None:
+            return cursor.fetchall(), None, False
+
+        rows, next_cursor = split_page(cursor.fetchall(), keyset, page[0])
+        return rows, next_cursor, True
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+def stream_listing(table, keyset, unpaginated_order='', key='data', transform=None, **envelope):
+    """
+    Mode ?stream=json|ndjson: seluruh tabel dikirim bertahap (fetchmany dari cursor unbuffered).
+    Mengembalikan None jika stream tidak diminta.
+    """
+    fmt = wants_stream(request.args)
+    if fmt is None:
+        return None
+    if parse_page_args(request.args, keyset) is not None:
+        raise ListingError('Parameter stream tidak bisa digabung dengan limit/after')
+    select = parse_fields(request.args, table)
+    query, params = listing_query(table, keyset, unpaginated_order, None, select)
+    return stream_query(query, params, fmt, key=key, envelope=envelope, transform=transform)
+
+def listing_response(rows, next_cursor, paginated, key='data', **extra):
+    body = dict(extra)
+    body[key] = rows
+    if paginated:
+        body['next_cursor'] = next_cursor
+    return jsonify(body)
+
+def format_deadline(order):
+    if order.get("deadline"):
+        order["deadline"] = order["deadline"].strftime("%Y-%m-%d")  # Format deadline
+    return order
 
 # GET : Mengurutkan data berdasarkan deadline terdekat 
 @orders_bp.route('/api/get_sorted_orders', methods=['GET'])
+@versioned('table_pesanan')
 def get_sorted_orders():
     """ Mengambil dan mengurutkan pesanan berdasarkan deadline terdekat hingga terjauh """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        # Mode stream untuk tabel besar
+        streamed = stream_listing('table_pesanan', DEADLINE_KEYSET, 'deadline ASC', key="orders",
+                                  transform=format_deadline)
+        if streamed is not None:
+            return streamed
 
         # Query untuk mendapatkan data dan mengurutkan berdasarkan deadline ASC (terdekat dulu)
-        cursor.execute("SELECT * FROM table_pesanan ORDER BY deadline ASC")
-        result = cursor.fetchall()
+        result, next_cursor, paginated = fetch_listing('table_pesanan', DEADLINE_KEYSET, 'deadline ASC')
 
         # Konversi deadline ke format YYYY-MM-DD
         for order in result:
-            if order["deadline"]:
-                order["deadline"] = order["deadline"].strftime("%Y-%m-%d")  # Format deadline
-
-
-        cursor.close()
-        conn.close()
+            format_deadline(order)
 
-        if result:
-            return jsonify({"orders": result}), 200
+        if result or paginated:
+            return listing_response(result, next_cursor, paginated, key="orders"), 200
         else:
             return jsonify({"error": "Tidak ada data pesanan"}), 404
 
+    except ListingError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
@@ -130,137 +191,113 @@ def get_nama_ket(id_input):
 
 # Endpoint untuk mengambil semua data dari table_urgent
 @orders_bp.route('/api/get_table_urgent', methods=['GET'])
+@versioned('table_urgent')
 def get_all_table_urgent():
-    conn = None  # Inisialisasi awal
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Ambil semua data dari table_urgent
-        cursor.execute("SELECT * FROM table_urgent ORDER BY deadline ASC")
-        data = cursor.fetchall()
+        # Ambil data dari table_urgent (urut deadline)
+        streamed = stream_listing('table_urgent', DEADLINE_KEYSET, 'deadline ASC', status="success")
+        if streamed is not None:
+            return streamed
 
-        cursor.close()
-        conn.close()
+        data, next_cursor, paginated = fetch_listing('table_urgent', DEADLINE_KEYSET, 'deadline ASC')
 
         # Perbaiki format response agar sesuai dengan fetchOrders()
-        return jsonify({
-            "status": "success",
-            "data": data
-        }), 200
+        return listing_response(data, next_cursor, paginated, status="success"), 200
 
+    except ListingError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
 # GET: Ambil semua data Dari table_produksi
 @orders_bp.route('/api/get_table_prod', methods=['GET'])
+@versioned('table_prod')
 def get_all_table_prod():
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        query = "SELECT * FROM table_prod"
-        cursor.execute(query)
-        results = cursor.fetchall()
+        streamed = stream_listing('table_prod', ID_KEYSET, status="success")
+        if streamed is not None:
+            return streamed
 
-        cursor.close()
-        conn.close()
-
-        return jsonify({"status": "success", "data": results}), 200
+        results, next_cursor, paginated = fetch_listing('table_prod', ID_KEYSET)
+        return listing_response(results, next_cursor, paginated, status="success"), 200
 
+    except ListingError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
     
-# GET: Ambil semua data Dari table_produksi
+# GET: Ambil semua data Dari table_design
 @orders_bp.route('/api/get_table_design', methods=['GET'])
+@versioned('table_design')
 def get_all_table_design():
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        streamed = stream_listing('table_design', ID_KEYSET, status="success")
+        if streamed is not None:
+            return streamed
 
-        query = "SELECT * FROM table_design"
-        cursor.execute(query)
-        results = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
-
-        return jsonify({"status": "success", "data": results}), 200
+        results, next_cursor, paginated = fetch_listing('table_design', ID_KEYSET)
+        return listing_response(results, next_cursor, paginated, status="success"), 200
 
+    except ListingError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
 # GET: Ambil semua data pesanan
 @orders_bp.route('/api/get-orders', methods=['GET'])
+@versioned('table_pesanan')
 def get_orders():
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM table_pesanan")
-        orders = cursor.fetchall()
-        return jsonify({'status': 'success', 'data': orders}), 200
+        streamed = stream_listing('table_pesanan', ID_KEYSET, status='success')
+        if streamed is not None:
+            return streamed
+
+        orders, next_cursor, paginated = fetch_listing('table_pesanan', ID_KEYSET)
+        return listing_response(orders, next_cursor, paginated, status='success'), 200
+    except ListingError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Error as e:
         logger.error(f"Error getting orders: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
-    finally:
-        if conn.is_connected(): 
-            cursor.close()
-            conn.close()
 
 # GET: Ambil semua data Inputable
 @orders_bp.route('/api/get-input-table', methods=['GET'])
+@versioned('table_input_order')
 def get_inputOrder():
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM table_input_order")
-        orders = cursor.fetchall()
-        return jsonify({'status': 'success', 'data': orders}), 200
+        streamed = stream_listing('table_input_order', ID_KEYSET, status='success')
+        if streamed is not None:
+            return streamed
+
+        orders, next_cursor, paginated = fetch_listing('table_input_order', ID_KEYSET)
+        return listing_response(orders, next_cursor, paginated, status='success'), 200
+    except ListingError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Error as e:
         logger.error(f"Error getting input table: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
-    finally:
-        if conn.is_connected(): 
-            cursor.close()
-            conn.close()
+
+# Kolom table_input_order yang disalin sync_engine ke table_pesanan (nama kolom di table_pesanan)
+PESANAN_SYNC_COLUMNS = {"id_pesanan": "id_pesanan", "Platform": "platform", "id_admin": "id_admin",
+                        "qty": "qty", "Deadline": "deadline"}
+
+def input_order_changes(id_input, fields, action='update'):
+    """ Event perubahan table_input_order beserta kolom yang ikut tersinkron ke table_pesanan """
+    fields = {k: v for k, v in fields.items() if k != 'id_input'}
+    pesanan_fields = {PESANAN_SYNC_COLUMNS[k]: v for k, v in fields.items() if k in PESANAN_SYNC_COLUMNS}
+    return [
+        events.change('table_input_order', id_input, fields, action),
+        events.change('table_pesanan', id_input, pesanan_fields, 'upsert' if action == 'insert' else action),
+    ]
 
 # Function to sync a single record from table_input_order to table_pesanan
 def sync_to_pesanan(cursor, id_input):
     try:
-        # Fetch the record from table_input_order
-        cursor.execute("SELECT * FROM table_input_order WHERE id_input = %s", (id_input,))
-        order = cursor.fetchone()
-        
-        if not order:
+        # Satu INSERT ... SELECT ... ON DUPLICATE KEY UPDATE (cek keberadaan hanya jika tidak ada baris berubah)
+        if not sync_engine.sync_one(cursor, id_input):
             return {'success': False, 'message': f'Order with id_input {id_input} not found'}
-        
-        # Check if record already exists in table_pesanan
-        cursor.execute("SELECT id_input FROM table_pesanan WHERE id_input = %s", (id_input,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing record
-            cursor.execute("""
-                UPDATE table_pesanan SET 
-                id_pesanan = %s,
-                qty = %s,
-                platform = %s,
-                deadline = %s,
-                layout_link = %s,
-                admin = %s,
-                timestamp = NOW()
-                WHERE id_input = %s
-            """, (order[2], order[5], order[4], order[8], order[7], order[3], id_input))
-        else:
-            # Insert new record
-            cursor.execute("""
-                INSERT INTO table_pesanan 
-                (id_pesanan, id_input, qty, platform, deadline, layout_link, admin, timestamp)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
-            """, (order[2], id_input, order[5], order[4], order[8], order[7], order[3]))
-        
         return {'success': True}
     
     except Exception as e:
@@ -270,46 +307,13 @@ def sync_to_pesanan(cursor, id_input):
 
 
 # Function to sync all records - can be called manually or periodically
-def sync_all_to_pesanan():
-    conn = None
-    cursor = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get all records from table_input_order
-        cursor.execute("SELECT id_input FROM table_input_order")
-        orders = cursor.fetchall()
-        
-        success_count = 0
-        error_count = 0
-        
-        for order in orders:
-            result = sync_to_pesanan(cursor, order['id_input'])
-            if result['success']:
-                success_count += 1
-            else:
-                error_count += 1
-        
-        conn.commit()
-        logger.info(f"Sync completed: {success_count} successful, {error_count} failed")
-        return {
-            'success': True, 
-            'success_count': success_count, 
-            'error_count': error_count
-        }
-    
-    except Exception as e:
-        logger.error(f"Error in sync_all_to_pesanan: {str(e)}")
-        if conn:
-            conn.rollback()
-        return {'success': False, 'message': str(e)}
-    
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+def sync_all_to_pesanan(mode='full'):
+    """ Sinkronisasi set-based per chunk; mode full, incremental atau auto (lihat sync_engine.sync) """
+    result = sync_engine.sync(mode)
+    if result['success']:
+        logger.info(f"Sync {result['mode']} completed: {result['inserted']} inserted, {result['updated']} updated "
+                    f"in {result['chunks']} chunks ({result['duration_ms']} ms)")
+    return result
 
 # PUT: Update input order with automatic sync to pesanan
 @orders_bp.route('/api/update-input-order/<string:id_input>', methods=['PUT'])
@@ -330,6 +334,11 @@ def update_input_order(id_input):
         if not existing:
             return jsonify({'status': 'error', 'message': 'Record not found'}), 404
         
+        # Hanya kolom yang benar-benar ada di table_input_order
+        invalid_columns = catalog.invalid_columns('table_input_order', data.keys(), cursor)
+        if invalid_columns:
+            return jsonify({'status': 'error', 'message': f'Kolom tidak valid: {", ".join(invalid_columns)}'}), 400
+        
         # Update table_input_order
         update_fields = []
         update_values = []
@@ -346,6 +355,8 @@ def update_input_order(id_input):
         # Add id_input to the end of values for WHERE clause
         update_values.append(id_input)
         
+        # Update, sync ke table_pesanan, outbox dan versi dalam satu transaksi
+        conn.start_transaction()
         query = f"UPDATE table_input_order SET {', '.join(update_fields)} WHERE id_input = %s"
         cursor.execute(query, update_values)
         
@@ -355,12 +366,15 @@ def update_input_order(id_input):
             conn.rollback()
             return jsonify({'status': 'error', 'message': sync_result['message']}), 500
         
+        changes = input_order_changes(id_input, data)
+        outbox.stage(cursor, changes)
         conn.commit()
+        events.publish(changes)
         return jsonify({'status': 'success', 'message': 'Data berhasil diperbarui dan disinkronkan'}), 200
     
     except Exception as e:
         logger.error(f"Error updating input order: {str(e)}")
-        if conn:
+        if conn and conn.in_transaction:
             conn.rollback()
         return jsonify({'status': 'error', 'message': str(e)}), 500
     
@@ -373,37 +387,14 @@ def update_input_order(id_input):
 # GET: Ambil daftar nama dari masing-masing tabel
 @orders_bp.route('/api/get-names', methods=['GET'])
 def get_names():
-    conn = None
-    cursor = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        tables = ['table_desainer', 'table_penjahit', 'table_qc', 'table_kurir', 'table_admin']
-        result = {}
-
-        for table in tables:
-            query = f"SELECT ID, Nama FROM `{table}`"
-            cursor.execute(query)
-            data = cursor.fetchall()
-
-            if not data:
-                result[table] = []
-            else:
-                result[table] = data
-        
-        return jsonify({'status': 'success', 'data': result}), 200
+        # Dilayani dari cache; DB hanya disentuh saat TTL habis atau setelah invalidate
+        return jsonify({'status': 'success', 'data': reference_cache.get()}), 200
 
     except Error as e:
         logger.error(f"Error getting names: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
-
 # GET: Ambil link foto berdasarkan id_input
 @orders_bp.route('/api/get_link_foto/<string:id_input>', methods=['GET'])
 def get_order_photo(id_input):
@@ -440,6 +431,73 @@ def get_order_photo(id_input):
         if 'conn' in locals() and conn.is_connected():
             conn.close()
     
+# Field default untuk batch lookup (pengganti get_id_admin, get_nama_ket, get_link_foto)
+BATCH_LOOKUP_FIELDS = ['id_admin', 'nama_ket', 'link']
+MAX_BATCH_IDS = 500
+
+# GET/POST: Ambil beberapa field untuk banyak id_input sekaligus (satu query WHERE id_input IN)
+@orders_bp.route('/api/get_input_fields', methods=['GET', 'POST'])
+def get_input_fields():
+    """
+    GET  /api/get_input_fields?ids=0125-00001,0125-00002&fields=id_admin,link
+    POST /api/get_input_fields  {"ids": [...], "fields": [...]}
+    Mengembalikan map {id_input: {field: value}} + daftar id yang tidak ditemukan.
+    """
+    conn = None
+    cursor = None
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            ids = data.get('ids') or []
+            fields = data.get('fields') or BATCH_LOOKUP_FIELDS
+        else:
+            ids = request.args.get('ids', '').split(',')
+            fields = request.args.get('fields', '').split(',') if request.args.get('fields') else BATCH_LOOKUP_FIELDS
+
+        if not isinstance(ids, list) or not isinstance(fields, list):
+            return jsonify({'status': 'error', 'message': 'ids dan fields harus berupa list'}), 400
+
+        # Hapus spasi/karakter tersembunyi dan duplikat, urutan dipertahankan
+        ids = list(dict.fromkeys(str(i).strip() for i in ids if str(i).strip()))
+        fields = list(dict.fromkeys(str(f).strip() for f in fields if str(f).strip()))
+        if not ids:
+            return jsonify({'status': 'error', 'message': 'ids wajib diisi'}), 400
+        if len(ids) > MAX_BATCH_IDS:
+            return jsonify({'status': 'error', 'message': f'Maksimal {MAX_BATCH_IDS} id_input per request'}), 400
+
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        invalid_columns = catalog.invalid_columns('table_input_order', fields, cursor)
+        if invalid_columns:
+            return jsonify({'status': 'error', 'message': f'Kolom tidak valid: {", ".join(invalid_columns)}'}), 400
+
+        select = ', '.join(f"`{field}`" for field in fields if field != 'id_input')
+        placeholders = ', '.join(['%s'] * len(ids))
+        query = f"SELECT id_input{', ' + select if select else ''} FROM table_input_order WHERE id_input IN ({placeholders})"
+        cursor.execute(query, ids)
+
+        result = {}
+        for row in cursor.fetchall():
+            result[row.pop('id_input')] = row
+
+        return jsonify({
+            'status': 'success',
+            'data': result,
+            'not_found': [i for i in ids if i not in result],
+            'retrieved_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        }), 200
+
+    except Error as e:
+        logger.error(f"Error batch lookup input order: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
 # Endpoint to manually transfer orders (keep for compatibility)
 @orders_bp.route('/api/transfer-orders', methods=['POST'])
 def transfer_orders():
@@ -448,7 +506,9 @@ def transfer_orders():
         if result['success']:
             return jsonify({
                 'status': 'success', 
-                'message': f'Data berhasil dipindahkan: {result["success_count"]} record berhasil'
+                'message': f'Data berhasil dipindahkan: {result["success_count"]} record berhasil',
+                'inserted': result['inserted'],
+                'updated': result['updated']
             }), 200
         else:
             return jsonify({'status': 'error', 'message': result['message']}), 500
@@ -472,6 +532,11 @@ def create_input_order():
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        # Hanya kolom yang benar-benar ada di table_input_order
+        invalid_columns = catalog.invalid_columns('table_input_order', data.keys(), cursor)
+        if invalid_columns:
+            return jsonify({'status': 'error', 'message': f'Kolom tidak valid: {", ".join(invalid_columns)}'}), 400
+        
         # Insert into table_input_order
         fields = []
         values = []
@@ -488,6 +553,8 @@ def create_input_order():
             values.append(datetime.now().strftime('%Y-%m-%d'))
             placeholders.append('%s')
         
+        # Insert, sync ke table_pesanan, outbox dan versi dalam satu transaksi
+        conn.start_transaction()
         query = f"INSERT INTO table_input_order ({', '.join(fields)}) VALUES ({', '.join(placeholders)})"
         cursor.execute(query, values)
         
@@ -497,12 +564,15 @@ def create_input_order():
             conn.rollback()
             return jsonify({'status': 'error', 'message': sync_result['message']}), 500
         
+        changes = input_order_changes(data['id_input'], dict(zip(fields, values)), action='insert')
+        outbox.stage(cursor, changes)
         conn.commit()
+        events.publish(changes)
         return jsonify({'status': 'success', 'message': 'Data berhasil disimpan dan disinkronkan'}), 201
     
     except Exception as e:
         logger.error(f"Error creating input order: {str(e)}")
-        if conn:
+        if conn and conn.in_transaction:
             conn.rollback()
         return jsonify({'status': 'error', 'message': str(e)}), 500
     
@@ -516,13 +586,24 @@ def create_input_order():
 @orders_bp.route('/api/sync-all-orders', methods=['POST'])
 def trigger_sync_all():
     try:
-        result = sync_all_to_pesanan()
+        # ?mode=incremental untuk sync berkala (hanya baris baru sejak watermark),
+        # ?mode=auto untuk incremental dengan fallback full scan berkala
+        mode = request.args.get('mode', 'full')
+        if mode not in ('full', 'incremental', 'auto'):
+            return jsonify({'status': 'error', 'message': 'mode harus full, incremental atau auto'}), 400
+
+        result = sync_all_to_pesanan(mode)
         if result['success']:
             return jsonify({
                 'status': 'success', 
                 'message': 'Sync completed', 
+                'mode': result['mode'],
                 'success_count': result['success_count'],
-                'error_count': result['error_count']
+                'error_count': result['error_count'],
+                'inserted': result['inserted'],
+                'updated': result['updated'],
+                'chunks': result['chunks'],
+                'duration_ms': result['duration_ms']
             }), 200
         else:
             return jsonify({'status': 'error', 'message': result['message']}), 500
@@ -1,15 +1,131 @@
-from flask import Flask, Blueprint, jsonify, request
-from flask_cors import CORS
+from flask import Blueprint, jsonify, request
 from mysql.connector import Error, InterfaceError
 from project_api.db import get_db_connection
+from project_api import outbox
+from project_api.id_allocator import allocator
+from project_api import events
 import datetime
 
-app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": ["http://127.0.0.1:5501", "http://localhost:5501"]}})
-
 # Blueprint untuk input order
 post_input_order_bp = Blueprint("input_order", __name__)
-CORS(post_input_order_bp)
+
+# Field wajib untuk setiap order
+REQUIRED_FIELDS = ["id_pesanan", "id_admin", "Platform", "qty", "Deadline"]
+
+# Batas order per request bulk dan baris per statement INSERT multi-row
+MAX_BULK_ORDERS = 1000
+INSERT_CHUNK_SIZE = 500
+
+# Kolom tiap tabel yang diisi saat order baru dibuat; urutan sama dengan tuple di order_rows()
+INSERT_TEMPLATES = {
+    "table_input_order": (
+        "(id_input, TimeTemp, id_pesanan, id_admin, Platform, qty, nama_ket, link, Deadline)",
+        "(%s, NOW(), %s, %s, %s, %s, %s, %s, %s)",
+    ),
+    "table_pesanan": (
+        "(id_pesanan, id_input, platform, id_admin, qty, deadline, "
+        "id_desainer, timestamp_designer, id_penjahit, timestamp_penjahit, "
+        "id_qc, timestamp_qc, status_print, status_produksi)",
+        "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, '-', '-')",
+    ),
+    "table_prod": (
+        "(id_input, platform, qty, deadline, status_print, status_produksi, timestamp)",
+        "(%s, %s, %s, %s, '-', 'Pilih Status', NOW())",
+    ),
+    "table_design": (
+        "(id_input, id_designer, platform, qty, layout_link, deadline, status_print, timestamp)",
+        "(%s, %s, %s, %s, %s, %s, '-', NOW())",
+    ),
+}
+
+
+def _optional_field(data, field):
+    """ Field opsional sebagai teks (angka dikonversi); list/objek ditolak dengan ValueError """
+    value = data.get(field)
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"Field {field} harus berupa teks")
+    return str(value).strip() if value else ""
+
+
+def parse_order(data):
+    """ Validasi dan normalisasi satu order; ValueError berisi pesan untuk klien """
+    if not isinstance(data, dict) or not data:
+        raise ValueError("Request body harus berupa JSON")
+
+    # Pastikan semua field wajib ada
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in data or not str(data[field]).strip()]
+    if missing_fields:
+        raise ValueError(f"Field berikut wajib diisi: {', '.join(missing_fields)}")
+
+    return {
+        "id_pesanan": str(data["id_pesanan"]).strip(),
+        "id_admin": str(data["id_admin"]).strip(),
+        "Platform": str(data["Platform"]).strip(),
+        "qty": int(data["qty"]),
+        "Deadline": str(data["Deadline"]).strip(),
+        "nama_ket": _optional_field(data, "nama_ket"),
+        "link": _optional_field(data, "link"),
+        "id_designer": _optional_field(data, "id_designer") or None,
+        "id_penjahit": _optional_field(data, "id_penjahit") or None,
+        "id_qc": _optional_field(data, "id_qc") or None,
+    }
+
+
+def order_rows(order, id_input, current_timestamp):
+    """ Tuple nilai untuk setiap tabel sesuai INSERT_TEMPLATES """
+    return {
+        "table_input_order": (
+            id_input, order["id_pesanan"], order["id_admin"], order["Platform"], order["qty"],
+            order["nama_ket"], order["link"], order["Deadline"],
+        ),
+        "table_pesanan": (
+            order["id_pesanan"], id_input, order["Platform"], order["id_admin"], order["qty"], order["Deadline"],
+            order["id_designer"], current_timestamp if order["id_designer"] else None,
+            order["id_penjahit"], current_timestamp if order["id_penjahit"] else None,
+            order["id_qc"], current_timestamp if order["id_qc"] else None,
+        ),
+        "table_prod": (id_input, order["Platform"], order["qty"], order["Deadline"]),
+        "table_design": (
+            id_input, order["id_designer"], order["Platform"], order["qty"], None, order["Deadline"],
+        ),
+    }
+
+
+def insert_orders(cursor, orders, current_timestamp):
+    """
+    INSERT order baru ke keempat tabel dengan INSERT multi-row.
+    `orders` berisi pasangan (id_input, order hasil parse_order).
+    """
+    rows_by_table = {table: [] for table in INSERT_TEMPLATES}
+    for id_input, order in orders:
+        for table, row in order_rows(order, id_input, current_timestamp).items():
+            rows_by_table[table].append(row)
+
+    for table, (columns, placeholder) in INSERT_TEMPLATES.items():
+        rows = rows_by_table[table]
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            values = [value for row in chunk for value in row]
+            cursor.execute(
+                f"INSERT INTO {table} {columns} VALUES {', '.join([placeholder] * len(chunk))}",
+                values
+            )
+
+
+def insert_changes(batch):
+    """ Event 'insert' untuk setiap order baru di keempat tabel """
+    changes = []
+    for id_input, order in batch:
+        fields = {k: v for k, v in order.items() if v not in (None, "")}
+        for table in INSERT_TEMPLATES:
+            changes.append(events.change(table, id_input, fields, action="insert"))
+    return changes
+
+
+def id_prefix(now):
+    """ Prefix id_input bulan berjalan: MMYY """
+    return f"{now.strftime('%m')}{now.strftime('%y')}"
+
 
 @post_input_order_bp.route("/api/input-order", methods=["OPTIONS", "POST"])
 def input_order():
@@ -18,33 +134,15 @@ def input_order():
 
     conn, cursor = None, None
     try:
-        # Validasi request JSON
-        data = request.get_json()
-        if not data:
-            return jsonify({"status": "error", "message": "Request body harus berupa JSON"}), 400
-
-        # Pastikan semua field wajib ada
-        required_fields = ["id_pesanan", "id_admin", "Platform", "qty", "Deadline"]
-        missing_fields = [field for field in required_fields if field not in data or not str(data[field]).strip()]
-        if missing_fields:
-            return jsonify({"status": "error", "message": f"Field berikut wajib diisi: {', '.join(missing_fields)}"}), 400
-
-        # Ambil data
-        id_pesanan = data["id_pesanan"].strip()
-        id_admin = data["id_admin"].strip()
-        platform = data["Platform"].strip()
-        qty = int(data["qty"])
-        deadline = data["Deadline"].strip()
-        nama_ket = data.get("nama_ket", "").strip()
-        link = data.get("link", "").strip()
-        id_designer = data.get("id_designer") or None
-        id_penjahit = data.get("id_penjahit") or None
-        id_qc = data.get("id_qc") or None
+        # Validasi dan normalisasi (aturan yang sama dengan endpoint bulk)
+        try:
+            order = parse_order(request.get_json(silent=True))
+        except (ValueError, TypeError) as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
 
         # Waktu sekarang
         now = datetime.datetime.now()
-        bulan = now.strftime("%m")
-        tahun = now.strftime("%y")
+        prefix = id_prefix(now)
         current_timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
 
         # Koneksi ke database
@@ -54,77 +152,33 @@ def input_order():
 
         cursor = conn.cursor()
 
-        # Generate unique ID dengan handling jika NULL
-        cursor.execute("SELECT id_input FROM table_input_order WHERE id_input LIKE %s ORDER BY id_input DESC LIMIT 1", (f"{bulan}{tahun}-%",))
-        last_id = cursor.fetchone()
-        last_num = int(last_id[0].split("-")[1]) + 1 if last_id and last_id[0] else 1
-        id_input = f"{bulan}{tahun}-{str(last_num).zfill(5)}"
+        # Generate unique ID dari counter per bulan (tanpa scan LIKE, aman untuk request paralel)
+        id_input = allocator.next_id(prefix)
 
         # Mulai transaksi
         conn.start_transaction()
 
-        # INSERT ke table_input_order
-        cursor.execute(
-            """
-            INSERT INTO table_input_order 
-            (id_input, TimeTemp, id_pesanan, id_admin, Platform, qty, nama_ket, link, Deadline) 
-            VALUES (%s, NOW(), %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (id_input, id_pesanan, id_admin, platform, qty, nama_ket, link, deadline)
-        )
-
-        # INSERT ke table_pesanan
-        cursor.execute(
-            """
-            INSERT INTO table_pesanan 
-            (id_pesanan, id_input, platform, id_admin, qty, deadline, 
-             id_desainer, timestamp_designer, id_penjahit, timestamp_penjahit, 
-             id_qc, timestamp_qc, status_print, status_produksi) 
-            VALUES (%s, %s, %s, %s, %s, %s, 
-                    %s, %s, %s, %s, 
-                    %s, %s, '-', '-')
-            """,
-            (id_pesanan, id_input, platform, id_admin, qty, deadline, 
-             id_designer, current_timestamp if id_designer else None,
-             id_penjahit, current_timestamp if id_penjahit else None,
-             id_qc, current_timestamp if id_qc else None)
-        )
-
-        # INSERT ke table_prod
-        cursor.execute(
-            """
-            INSERT INTO table_prod 
-            (id_input, platform, qty, deadline, status_print, status_produksi, timestamp)
-            VALUES (%s, %s, %s, %s, '-', 'Pilih Status', NOW())
-            """,
-            (id_input, platform, qty, deadline)
-        )
-
-        # INSERT ke table_design
-        cursor.execute(
-            """
-            INSERT INTO table_design 
-            (id_input, id_designer, platform, qty, layout_link, deadline, status_print, timestamp)
-            VALUES (%s, %s, %s, %s, %s, %s, '-', NOW())
-            """,
-            (id_input, id_designer, platform, qty, None, deadline)
-        )
+        # INSERT ke table_input_order, table_pesanan, table_prod dan table_design
+        insert_orders(cursor, [(id_input, order)], current_timestamp)
 
         # Commit transaksi
+        changes = insert_changes([(id_input, order)])
+        outbox.stage(cursor, changes)
         conn.commit()
+        events.publish(changes)
 
         return jsonify({
             "status": "success",
             "message": "Data pesanan berhasil dimasukkan dan disinkronkan",
             "data": {
                 "id_input": id_input,
-                "id_pesanan": id_pesanan,
-                "id_admin": id_admin,
-                "Platform": platform,
-                "qty": qty,
-                "nama_ket": nama_ket,
-                "link": link,
-                "Deadline": deadline,
+                "id_pesanan": order["id_pesanan"],
+                "id_admin": order["id_admin"],
+                "Platform": order["Platform"],
+                "qty": order["qty"],
+                "nama_ket": order["nama_ket"],
+                "link": order["link"],
+                "Deadline": order["Deadline"],
                 "TimeTemp": current_timestamp
             }
         }), 201
@@ -144,6 +198,87 @@ def input_order():
             conn.close()
 
 
+@post_input_order_bp.route("/api/input-order/bulk", methods=["OPTIONS", "POST"])
+def input_order_bulk():
+    """
+    Import banyak order sekaligus (mis. batch marketplace).
+    Body: {"orders": [ {...}, ... ]} atau langsung list order.
+    Order yang tidak valid dilaporkan per item; order valid mendapat blok id_input berurutan
+    dan ditulis ke keempat tabel dengan INSERT multi-row dalam satu transaksi.
+    """
+    if request.method == "OPTIONS":
+        return _handle_cors_preflight()
+
+    conn, cursor = None, None
+    try:
+        data = request.get_json(silent=True)
+        orders = data.get("orders") if isinstance(data, dict) else data
+        if not isinstance(orders, list) or not orders:
+            return jsonify({"status": "error", "message": "Body harus berisi list orders"}), 400
+        if len(orders) > MAX_BULK_ORDERS:
+            return jsonify({"status": "error", "message": f"Maksimal {MAX_BULK_ORDERS} order per request"}), 400
+
+        # Validasi per item
+        results = []
+        valid = []
+        for index, item in enumerate(orders):
+            try:
+                valid.append((index, parse_order(item)))
+                results.append(None)
+            except (ValueError, TypeError) as e:
+                results.append({"index": index, "status": "error", "message": str(e)})
+
+        if valid:
+            now = datetime.datetime.now()
+            prefix = id_prefix(now)
+            current_timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+
+            # Blok id_input berurutan dipesan atomik dari counter per bulan
+            ids = allocator.allocate_block(prefix, len(valid))
+            batch = [(id_input, order) for id_input, (_, order) in zip(ids, valid)]
+
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            conn.start_transaction()
+
+            insert_orders(cursor, batch, current_timestamp)
+            changes = insert_changes(batch)
+            outbox.stage(cursor, changes)
+            conn.commit()
+            events.publish(changes)
+
+            for (index, order), (id_input, _) in zip(valid, batch):
+                results[index] = {
+                    "index": index,
+                    "status": "success",
+                    "id_input": id_input,
+                    "id_pesanan": order["id_pesanan"],
+                }
+
+        inserted = len(valid)
+        return jsonify({
+            "status": "success" if inserted == len(orders) else ("partial" if inserted else "error"),
+            "message": f"{inserted} dari {len(orders)} order berhasil dimasukkan",
+            "inserted": inserted,
+            "failed": len(orders) - inserted,
+            "results": results
+        }), 201 if inserted else 400
+
+    except (InterfaceError, Error) as e:
+        if conn:
+            conn.rollback()
+        return jsonify({"status": "error", "message": f"Kesalahan: {str(e)}"}), 500
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({"status": "error", "message": f"Kesalahan sistem: {str(e)}"}), 500
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+
 # Fungsi untuk menangani request OPTIONS (CORS Preflight)
 def _handle_cors_preflight():
     response = jsonify({"status": "success", "message": "Preflight OK"})
@@ -1,27 +1,42 @@
-from flask import Flask, Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
+from project_api import events, outbox
 import logging
 import traceback
 from datetime import datetime
-from flask_cors import CORS
-
-app = Flask(__name__)  
 
 # Setup Blueprint
 post_urgent_bp = Blueprint('post_urgent_bp', __name__)
-CORS(post_urgent_bp)  # Aktifkan CORS hanya untuk blueprint ini
-
-# Konfigurasi logger
-logging.basicConfig(
-    level=logging.DEBUG,  # Change to DEBUG for more detailed logs
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('urgent_move.log'),  # Log to file
-        logging.StreamHandler()  # Also log to console
-    ]
-)
+
+# File log urgent_move.log dipasang oleh create_app (URGENT_LOG_FILE), bukan saat import
 logger = logging.getLogger(__name__)
 
+def promote_urgent_orders(cursor, day):
+    """
+    Salin semua order dengan Deadline = `day` ke table_urgent dalam satu statement
+    (INSERT ... SELECT ... ON DUPLICATE KEY UPDATE). Dipakai oleh endpoint dan scheduler.
+    Mengembalikan affected rows dari MySQL (baris yang diubah dihitung dua kali).
+    """
+    cursor.execute("""
+        INSERT INTO table_urgent (id_input, platform, qty, deadline)
+        SELECT id_input, Platform, qty, Deadline FROM table_input_order
+        WHERE Deadline = %s
+        ON DUPLICATE KEY UPDATE platform=VALUES(platform), qty=VALUES(qty), deadline=VALUES(deadline)
+    """, (day,))
+    return cursor.rowcount
+
+
+def urgent_changes(orders):
+    """ Event upsert table_urgent untuk baris (id_input, Platform, qty, Deadline) tuple atau dict """
+    changes = []
+    for order in orders:
+        if not isinstance(order, dict):
+            order = dict(zip(('id_input', 'Platform', 'qty', 'Deadline'), order))
+        changes.append(events.change('table_urgent', order['id_input'], {
+            "platform": order['Platform'], "qty": order['qty'], "deadline": order['Deadline']
+        }, action='upsert'))
+    return changes
+
 @post_urgent_bp.route('/api/move_to_table_urgent', methods=['POST'])
 def move_to_table_urgent():
     conn = None
@@ -64,20 +79,15 @@ def move_to_table_urgent():
 
         logger.info(f"Orders fetched for deadline {today}: {orders}")
 
-        # Masukkan data ke table_urgent jika belum ada
-        inserted_count = 0
-        for order in orders:
-            try:
-                cursor.execute("""
-                    INSERT INTO table_urgent (id_input, platform, qty, deadline)
-                    VALUES (%s, %s, %s, %s)
-                    ON DUPLICATE KEY UPDATE platform=VALUES(platform), qty=VALUES(qty), deadline=VALUES(deadline)
-                """, (order["id_input"], order["Platform"], order["qty"], order["Deadline"]))
-                inserted_count += 1
-            except Exception as insert_error:
-                logger.error(f"Error inserting order {order['id_input']}: {str(insert_error)}")
+        # Masukkan data ke table_urgent dengan satu upsert multi-row (+ outbox) dalam satu transaksi
+        conn.start_transaction()
+        promote_urgent_orders(cursor, today)
+        inserted_count = len(orders)
+        changes = urgent_changes(orders)
+        outbox.stage(cursor, changes)
 
         conn.commit()
+        events.publish(changes)
         return jsonify({
             "status": "success",
             "message": "Data berhasil dipindahkan ke table_urgent",
@@ -86,6 +96,8 @@ def move_to_table_urgent():
         }), 200
 
     except Exception as e:
+        if conn and conn.in_transaction:
+            conn.rollback()
         logger.error(f"Error in move_to_table_urgent: {str(e)}")
         logger.error(traceback.format_exc())  # Log full stack trace
         return jsonify({
@@ -1,62 +1,92 @@
-from flask import Blueprint, request, jsonify, Flask
-from flask_cors import CORS
+from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
+from project_api import events, outbox
+from project_api.bulk import group_by_fields, parse_bulk_updates
+from project_api.schema_catalog import catalog
 import logging
 
-# 🔹 Inisialisasi Flask
-app = Flask(__name__)
-CORS(app)
-
 # 🔹 Inisialisasi Blueprint
 update_design_bp = Blueprint('design', __name__)
-CORS(update_design_bp)
 
-# 🔹 Konfigurasi Logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@app.route('/')
-def index():
-    return "Server Flask berjalan!"
+# Kolom table_design yang disalin ke table_pesanan (nama kolom di table_pesanan)
+PESANAN_COLUMNS = {"id_designer": "id_desainer", "layout_link": "layout_link", "status_print": "status_print"}
+
+# Kolom yang boleh diubah lewat /api/update-design
+DESIGN_FIELDS = ["id_designer", "layout_link", "status_print"]
+
+def build_design_update(id_inputs, fields):
+    """
+    Satu multi-table UPDATE untuk table_design beserta sinkronisasinya:
+    - table_pesanan: id_desainer, layout_link, status_print (+ timestamp_designer sekali saat
+      desainer pertama kali ditetapkan)
+    - table_prod dan table_urgent: status_print, hanya jika status_print ikut berubah
+    Tabel lain di-LEFT JOIN sehingga id_input yang tidak punya baris di sana dilewati.
+    Urutan assignment antar tabel di multi-table UPDATE tidak dijamin, jadi kolom yang berubah
+    disalin dari nilai literal, bukan dari d.<kolom>.
+    """
+    joins = ["LEFT JOIN table_pesanan p ON p.id_input = d.id_input"]
+    assignments = [f"d.{column} = %s" for column in fields]
+    values = list(fields.values())
+
+    for column, target in PESANAN_COLUMNS.items():
+        if column in fields:
+            assignments.append(f"p.{target} = %s")
+            values.append(fields[column])
+        else:
+            assignments.append(f"p.{target} = d.{column}")
+    if "id_designer" in fields:
+        assignments.append("p.timestamp_designer = COALESCE(p.timestamp_designer, CURRENT_TIMESTAMP)")
+
+    if "status_print" in fields:
+        joins.append("LEFT JOIN table_prod pr ON pr.id_input = d.id_input")
+        joins.append("LEFT JOIN table_urgent u ON u.id_input = d.id_input")
+        assignments += ["pr.status_print = %s", "u.status_print = %s"]
+        values += [fields["status_print"], fields["status_print"]]
 
-def execute_update(query, values, conn, cursor):
-    """ Helper untuk eksekusi query update dengan logging """
+    placeholders = ", ".join(["%s"] * len(id_inputs))
+    query = (f"UPDATE table_design d {' '.join(joins)} SET {', '.join(assignments)} "
+             f"WHERE d.id_input IN ({placeholders})")
+    return query, values + list(id_inputs)
+
+def apply_design_update(conn, cursor, id_input, fields):
+    """
+    Update desain + sinkronisasi + outbox dalam satu transaksi dan satu commit.
+    Mengembalikan daftar perubahan untuk events.publish (kosong jika id_input tidak ada).
+    """
+    conn.start_transaction()
     try:
+        query, values = build_design_update([id_input], fields)
         cursor.execute(query, values)
+        if cursor.rowcount == 0:
+            # Tidak ada baris berubah: bisa karena nilai sama, atau id_input memang tidak ada
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM table_design WHERE id_input = %s) AS found", (id_input,))
+            row = cursor.fetchone()
+            found = row["found"] if isinstance(row, dict) else row[0]
+            if not found:
+                conn.rollback()
+                return []
+        changes = design_changes(id_input, fields)
+        outbox.stage(cursor, changes)
         conn.commit()
-        logger.info(f"✅ Update berhasil: {query} dengan {values}")
     except Exception as e:
         conn.rollback()
-        logger.error(f"❌ Error update: {str(e)}")
+        logger.error(f"❌ Error update desain {id_input}: {str(e)}")
         raise
+    logger.info(f"✅ Desain {id_input} diperbarui & disinkronkan: {fields}")
+    return changes
 
-def sync_tables(id_input, conn, cursor, columns=None):
-    """ Sinkronisasi table_pesanan dan table_prod """
-    cursor.execute("""
-        UPDATE table_pesanan p
-        JOIN table_design d ON p.id_input = d.id_input
-        SET 
-            p.id_desainer = d.id_designer,
-            p.layout_link = d.layout_link,
-            p.status_print = d.status_print
-        WHERE p.id_input = %s
-    """, (id_input,))
-    
-    # 🔹 Tambahkan update timestamp_designer jika id_designer diperbarui
-    if columns and "id_designer" in columns:
-        cursor.execute("""
-            UPDATE table_pesanan 
-            SET id_desainer = %s, 
-                timestamp_designer = COALESCE(timestamp_designer, CURRENT_TIMESTAMP) 
-            WHERE id_input = %s
-        """, (columns["id_designer"], id_input))
-        logger.info(f"✅ id_desainer dan timestamp_designer diperbarui untuk id_input: {id_input}")
-
-    if columns and "status_print" in columns:
-        cursor.execute("UPDATE table_prod SET status_print = %s WHERE id_input = %s", (columns["status_print"], id_input))
-        logger.info(f"✅ status_print diperbarui di table_prod untuk id_input: {id_input}")
-        cursor.execute("UPDATE table_urgent SET status_print = %s WHERE id_input = %s", (columns["status_print"], id_input))
-        logger.info(f"✅ status_print diperbarui di table_urgent untuk id_input: {id_input}")
+def design_changes(id_input, fields):
+    """ Event perubahan untuk setiap tabel yang tersentuh oleh update desain """
+    changes = [events.change('table_design', id_input, fields)]
+    pesanan_fields = {PESANAN_COLUMNS[k]: v for k, v in fields.items() if k in PESANAN_COLUMNS}
+    if pesanan_fields:
+        changes.append(events.change('table_pesanan', id_input, pesanan_fields))
+    if "status_print" in fields:
+        for table in ('table_prod', 'table_urgent'):
+            changes.append(events.change(table, id_input, {"status_print": fields["status_print"]}))
+    return changes
 
 
 @update_design_bp.route('/api/update-design', methods=['PUT'])
@@ -69,15 +99,17 @@ def update_design():
         if not id_input:
             return jsonify({'status': 'error', 'message': 'id_input wajib diisi'}), 400
 
-        cursor.execute("SELECT id_input FROM table_design WHERE id_input = %s", (id_input,))
-        if not cursor.fetchone():
-            return jsonify({'status': 'error', 'message': 'Data tidak ditemukan di table_design'}), 404
+        update_fields = {k: v for k, v in data.items() if k in DESIGN_FIELDS and v is not None}
+        if not update_fields:
+            cursor.execute("SELECT id_input FROM table_design WHERE id_input = %s", (id_input,))
+            if not cursor.fetchone():
+                return jsonify({'status': 'error', 'message': 'Data tidak ditemukan di table_design'}), 404
+            return jsonify({'status': 'success', 'message': 'Data berhasil diperbarui & disinkronkan'}), 200
 
-        update_fields = {k: v for k, v in data.items() if k in ["id_designer", "layout_link", "status_print"] and v is not None}
-        if update_fields:
-            query = "UPDATE table_design SET " + ", ".join(f"{k} = %s" for k in update_fields.keys()) + " WHERE id_input = %s"
-            execute_update(query, list(update_fields.values()) + [id_input], conn, cursor)
-            sync_tables(id_input, conn, cursor, update_fields)
+        changes = apply_design_update(conn, cursor, id_input, update_fields)
+        if not changes:
+            return jsonify({'status': 'error', 'message': 'Data tidak ditemukan di table_design'}), 404
+        events.publish(changes)
 
         return jsonify({'status': 'success', 'message': 'Data berhasil diperbarui & disinkronkan'}), 200
     except Exception as e:
@@ -95,11 +127,11 @@ def update_print_status():
         id_input, column, value = data.get('id_input'), data.get('column'), data.get('value')
         allowed_columns = ["id_designer", "status_print", "layout_link", "platform", "qty", "deadline"]
 
-        if column not in allowed_columns:
+        if column not in allowed_columns or catalog.invalid_columns('table_design', [column], cursor):
             return jsonify({'status': 'error', 'message': 'Kolom tidak valid'}), 400
         
-        execute_update(f"UPDATE table_design SET {column} = %s WHERE id_input = %s", (value, id_input), conn, cursor)
-        sync_tables(id_input, conn, cursor, {column: value} if column == "status_print" else None)
+        changes = apply_design_update(conn, cursor, id_input, {column: value})
+        events.publish(changes)
         
         return jsonify({'status': 'success', 'message': f'{column} berhasil diperbarui & disinkronkan'}), 200
     except Exception as e:
@@ -107,3 +139,56 @@ def update_print_status():
     finally:
         cursor.close()
         conn.close()
+
+@update_design_bp.route('/api/update-design/bulk', methods=['PUT'])
+def update_design_bulk():
+    """
+    Update desain banyak order sekaligus (mis. satu batch print selesai, atau assign desainer).
+    Validasi id_input dengan satu query, lalu setiap kelompok perubahan identik dijalankan sebagai
+    satu multi-table UPDATE (lihat build_design_update); semuanya dalam satu transaksi.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        try:
+            updates = parse_bulk_updates(request.get_json(silent=True), DESIGN_FIELDS)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+
+        placeholders = ", ".join(["%s"] * len(updates))
+        cursor.execute(f"SELECT id_input FROM table_design WHERE id_input IN ({placeholders})", list(updates))
+        found = {str(row[0]) for row in cursor.fetchall()}
+        not_found = [id_input for id_input in updates if id_input not in found]
+        updates = {id_input: fields for id_input, fields in updates.items() if id_input in found}
+
+        changes = []
+        if updates:
+            conn.start_transaction()
+            try:
+                for fields, ids in group_by_fields(updates):
+                    query, values = build_design_update(ids, fields)
+                    cursor.execute(query, values)
+                    for id_input in ids:
+                        changes.extend(design_changes(id_input, fields))
+                outbox.stage(cursor, changes)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            events.publish(changes)
+            logger.info(f"✅ Bulk update desain: {len(updates)} order diperbarui & disinkronkan")
+
+        updated = len(updates)
+        total = updated + len(not_found)
+        return jsonify({
+            'status': 'success' if not not_found else ('partial' if updated else 'error'),
+            'message': f'{updated} dari {total} order berhasil diperbarui & disinkronkan',
+            'updated': updated,
+            'not_found': not_found
+        }), 200 if updated else 404
+    except Exception as e:
+        logger.error(f"❌ Error bulk update desain: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,78 +1,98 @@
-from flask import Blueprint, request, jsonify, Flask
-from flask_cors import CORS
+from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
+from project_api import outbox
+from project_api import events
+from project_api.bulk import group_by_fields, parse_bulk_updates
+from project_api.schema_catalog import catalog
 import logging
 import mysql.connector
 
-# 🔹 Inisialisasi Flask
-app = Flask(__name__)
-CORS(app)
-
 # 🔹 Initialize Blueprint
 sync_prod_bp = Blueprint('sync_prod', __name__)
-CORS(sync_prod_bp)
 
-# 🔹 Configure Logger
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-def get_db_columns(table_name):
-    """ Retrieve column names for a given table """
-    conn = None
+# Kolom yang boleh diubah dari halaman produksi
+PROD_FIELDS = ["id_penjahit", "id_qc", "status_produksi"]
+
+# Tabel yang disinkronkan beserta alias di query multi-table UPDATE
+SYNC_TABLES = [
+    ('table_prod', 'pr'),
+    ('table_pesanan', 'p'),
+    ('table_urgent', 'u'),
+]
+
+# Timestamp di table_pesanan yang diisi sekali saat penjahit/QC pertama kali ditetapkan
+TIMESTAMP_FIELDS = {
+    'id_penjahit': 'timestamp_penjahit',
+    'id_qc': 'timestamp_qc',
+}
+
+def get_db_columns(cursor, table_name):
+    """ Retrieve column names for a given table (dari schema catalog, tanpa query per request) """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(f"SHOW COLUMNS FROM {table_name}")
-        return [column[0] for column in cursor.fetchall()]
+        return catalog.columns(table_name, cursor)
     except mysql.connector.Error as e:
         logger.error(f"❌ Error retrieving columns for {table_name}: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
-def validate_input(id_input):
-    """ Validasi apakah id_input ada di database """
-    conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Cek keberadaan id_input di tabel yang diperlukan
-        tables_to_check = ['table_prod', 'table_pesanan']
-        for table in tables_to_check:
-            cursor.execute(f"SELECT 1 FROM {table} WHERE id_input = %s", (id_input,))
-            if not cursor.fetchone():
-                return False, f'Data tidak ditemukan di {table}'
-        
-        return True, None
-    except mysql.connector.Error as e:
-        logger.error(f"❌ Validation Error: {e}")
-        return False, 'Kesalahan validasi database'
-    finally:
-        if conn:
-            conn.close()
+def validate_input(cursor, id_input):
+    """ Validasi apakah id_input ada di table_prod dan table_pesanan (satu query) """
+    cursor.execute("""
+        SELECT
+            EXISTS(SELECT 1 FROM table_prod WHERE id_input = %s),
+            EXISTS(SELECT 1 FROM table_pesanan WHERE id_input = %s)
+    """, (id_input, id_input))
+    in_prod, in_pesanan = cursor.fetchone()
+    if not in_prod:
+        return False, 'Data tidak ditemukan di table_prod'
+    if not in_pesanan:
+        return False, 'Data tidak ditemukan di table_pesanan'
+    return True, None
 
-def execute_update(query, values):
-    """ Eksekusi query update dengan commit dan error handling """
-    conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, values)
-        conn.commit()
-        return True, None
-    except mysql.connector.Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"❌ Error executing query: {e}")
-        return False, str(e)
-    finally:
-        if conn:
-            conn.close()
+def build_sync_update(id_inputs, changes, columns_by_table):
+    """
+    Susun satu multi-table UPDATE untuk table_prod, table_pesanan dan table_urgent
+    untuk semua `id_inputs` (list) sekaligus.
+    Tabel yang tidak punya semua kolom di `changes` dilewati; table_urgent di-LEFT JOIN
+    karena tidak semua pesanan ada di sana.
+    """
+    joins = []
+    updated_tables = []
+    assignments = []
+    values = []
+    base_alias = None
+    for table, alias in SYNC_TABLES:
+        table_columns = columns_by_table.get(table, [])
+        invalid_columns = [col for col in changes if col not in table_columns]
+        if invalid_columns:
+            logger.warning(f"Kolom tidak valid di {table}: {invalid_columns}")
+            continue
+
+        updated_tables.append(table)
+        if base_alias is None:
+            base_alias = alias
+            joins.append(f"{table} {alias}")
+        else:
+            join_type = "LEFT JOIN" if table == 'table_urgent' else "JOIN"
+            joins.append(f"{join_type} {table} {alias} ON {alias}.id_input = {base_alias}.id_input")
+
+        for col, value in changes.items():
+            assignments.append(f"{alias}.{col} = %s")
+            values.append(value)
+
+        if table == 'table_pesanan':
+            for col, ts_col in TIMESTAMP_FIELDS.items():
+                if col in changes and ts_col in table_columns:
+                    assignments.append(f"{alias}.{ts_col} = COALESCE({alias}.{ts_col}, CURRENT_TIMESTAMP)")
+
+    if base_alias is None:
+        return None, None, []
+
+    placeholders = ", ".join(["%s"] * len(id_inputs))
+    query = f"UPDATE {' '.join(joins)} SET {', '.join(assignments)} WHERE {base_alias}.id_input IN ({placeholders})"
+    values.extend(id_inputs)
+    return query, values, updated_tables
 
 @sync_prod_bp.route('/api/sync-prod-to-pesanan', methods=['PUT'])
 def sync_prod_to_pesanan():
@@ -92,9 +112,6 @@ def sync_prod_to_pesanan():
     
     # Ekstrak data yang diperlukan
     id_input = data.get('id_input')
-    id_penjahit = data.get('id_penjahit')
-    id_qc = data.get('id_qc')
-    status_produksi = data.get('status_produksi')
     
     # Validasi id_input
     if not id_input:
@@ -103,105 +120,154 @@ def sync_prod_to_pesanan():
             'message': 'id_input wajib diisi'
         }), 400
     
-    # Validasi data input ada di database
-    is_valid, error_message = validate_input(id_input)
-    if not is_valid:
-        return jsonify({
-            'status': 'error', 
-            'message': error_message
-        }), 404
-    
-    # Siapkan field yang akan diupdate
-    update_fields = []
-    update_values = []
-    
-    # Tambahkan field yang tidak None
-    if id_penjahit is not None:
-        update_fields.append("id_penjahit = %s")
-        update_values.append(id_penjahit)
-    if id_qc is not None:
-        update_fields.append("id_qc = %s")
-        update_values.append(id_qc)
-    if status_produksi is not None:
-        update_fields.append("status_produksi = %s")
-        update_values.append(status_produksi)
+    # Field yang tidak None saja yang diupdate
+    changes = {field: data.get(field) for field in PROD_FIELDS if data.get(field) is not None}
     
     # Jika tidak ada field yang diupdate
-    if not update_fields:
+    if not changes:
         return jsonify({
             'status': 'error', 
             'message': 'Tidak ada data yang diperbarui'
         }), 400
     
-    # Tambahkan id_input sebagai kondisi WHERE terakhir
-    update_values.append(id_input)
-    
-    # Daftar tabel yang akan diupdate
-    tables_to_update = [
-        'table_prod', 
-        'table_pesanan', 
-        'table_urgent'
-    ]
-    
-    # Proses update untuk setiap tabel
-    update_success = True
-    error_messages = []
-    
-    for table in tables_to_update:
-        # Validasi kolom di tabel
-        table_columns = get_db_columns(table)
-        invalid_columns = [
-            col.split('=')[0].strip() 
-            for col in update_fields 
-            if col.split('=')[0].strip() not in table_columns
-        ]
-        
-        if invalid_columns:
-            logger.warning(f"Kolom tidak valid di {table}: {invalid_columns}")
-            continue
-        
-        # Buat query update
-        query_update = f"UPDATE {table} SET {', '.join(update_fields)} WHERE id_input = %s"
-        
-        # Eksekusi update
-        success, error = execute_update(query_update, update_values)
-        if not success:
-            update_success = False
-            error_messages.append(f"Update {table} gagal: {error}")
-    
-    # Proses timestamp jika ada perubahan penjahit atau QC
-    if update_success:
-        timestamp_updates = []
-        
-        if "id_penjahit = %s" in update_fields:
-            timestamp_updates.append((
-                """UPDATE table_pesanan 
-                SET timestamp_penjahit = COALESCE(timestamp_penjahit, CURRENT_TIMESTAMP) 
-                WHERE id_input = %s""", 
-                (id_input,)
-            ))
-        
-        if "id_qc = %s" in update_fields:
-            timestamp_updates.append((
-                """UPDATE table_pesanan 
-                SET timestamp_qc = COALESCE(timestamp_qc, CURRENT_TIMESTAMP) 
-                WHERE id_input = %s""", 
-                (id_input,)
-            ))
-        
-        # Eksekusi update timestamp
-        for query, params in timestamp_updates:
-            execute_update(query, params)
-        
+    # Satu koneksi dan satu transaksi untuk seluruh request
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        # Validasi data input ada di database
+        is_valid, error_message = validate_input(cursor, id_input)
+        if not is_valid:
+            return jsonify({
+                'status': 'error', 
+                'message': error_message
+            }), 404
+
+        columns_by_table = {table: get_db_columns(cursor, table) for table, _ in SYNC_TABLES}
+        query_update, update_values, updated_tables = build_sync_update([id_input], changes, columns_by_table)
+        if not query_update:
+            return jsonify({
+                'status': 'error', 
+                'message': 'Kolom tidak valid di semua tabel produksi'
+            }), 400
+
+        # Update prod, pesanan, urgent dan timestamp dalam satu statement
+        conn.start_transaction()
+        cursor.execute(query_update, update_values)
+        table_changes = [events.change(table, id_input, changes) for table in updated_tables]
+        outbox.stage(cursor, table_changes)
+        conn.commit()
+        events.publish(table_changes)
+
         logger.info(f"✅ Data produksi berhasil diperbarui untuk id_input: {id_input}")
         return jsonify({
             'status': 'success', 
             'message': 'Data produksi berhasil diperbarui & timestamp disinkronkan'
         }), 200
-    
-    # Jika update gagal
-    return jsonify({
-        'status': 'error', 
-        'message': 'Gagal memperbarui data',
-        'details': error_messages
-    }), 500
\ No newline at end of file
+
+    except mysql.connector.Error as e:
+        if conn:
+            conn.rollback()
+        logger.error(f"❌ Error executing query: {e}")
+        return jsonify({
+            'status': 'error', 
+            'message': 'Gagal memperbarui data',
+            'details': [str(e)]
+        }), 500
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+
+def validate_inputs(cursor, id_inputs):
+    """ id_input yang ada di table_prod dan table_pesanan (satu query untuk semua id) """
+    placeholders = ", ".join(["%s"] * len(id_inputs))
+    cursor.execute(f"""
+        SELECT pr.id_input
+        FROM table_prod pr
+        JOIN table_pesanan p ON p.id_input = pr.id_input
+        WHERE pr.id_input IN ({placeholders})
+    """, list(id_inputs))
+    return {str(row[0]) for row in cursor.fetchall()}
+
+@sync_prod_bp.route('/api/sync-prod-to-pesanan/bulk', methods=['PUT'])
+def sync_prod_to_pesanan_bulk():
+    """
+    Update data produksi (penjahit, QC, status) banyak order sekaligus.
+    Semua id_input divalidasi dengan satu query; id yang tidak ada di table_prod/table_pesanan
+    dilaporkan di not_found. Order dengan perubahan identik dijalankan sebagai satu multi-table
+    UPDATE ... IN (...) (lihat build_sync_update), semuanya dalam satu transaksi.
+    """
+    try:
+        updates = parse_bulk_updates(request.get_json(silent=True), PROD_FIELDS)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        found = validate_inputs(cursor, updates)
+        not_found = [id_input for id_input in updates if id_input not in found]
+        updates = {id_input: changes for id_input, changes in updates.items() if id_input in found}
+
+        columns_by_table = {table: get_db_columns(cursor, table) for table, _ in SYNC_TABLES}
+        statements = []
+        for changes, ids in group_by_fields(updates):
+            query_update, update_values, updated_tables = build_sync_update(ids, changes, columns_by_table)
+            if not query_update:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Kolom tidak valid di semua tabel produksi'
+                }), 400
+            statements.append((query_update, update_values, [
+                events.change(table, id_input, changes) for id_input in ids for table in updated_tables
+            ]))
+
+        table_changes = []
+        if statements:
+            conn.start_transaction()
+            try:
+                for query_update, update_values, group_changes in statements:
+                    cursor.execute(query_update, update_values)
+                    table_changes.extend(group_changes)
+                outbox.stage(cursor, table_changes)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            events.publish(table_changes)
+            logger.info(f"✅ Bulk update produksi: {len(updates)} order diperbarui dalam {len(statements)} statement")
+
+        updated = len(updates)
+        total = updated + len(not_found)
+        return jsonify({
+            'status': 'success' if not not_found else ('partial' if updated else 'error'),
+            'message': f'{updated} dari {total} order berhasil diperbarui & timestamp disinkronkan',
+            'updated': updated,
+            'not_found': not_found
+        }), 200 if updated else 404
+
+    except mysql.connector.Error as e:
+        logger.error(f"❌ Error executing bulk query: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Gagal memperbarui data',
+            'details': [str(e)]
+        }), 500
+    except Exception as e:
+        logger.error(f"❌ Error bulk update produksi: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
@@ -2,8 +2,6 @@ from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
 import logging
 
-# Configure logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 sync_print_status_bp = Blueprint('sync_print_status', __name__)
@@ -1,14 +1,11 @@
-from flask import Flask, Blueprint, request, jsonify
-from flask_cors import CORS
+from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
+from project_api import outbox
+from project_api import events
 import logging  # ✅ Tetap digunakan
 
-app = Flask(__name__)
 update_order_bp = Blueprint('update', __name__)
-CORS(update_order_bp)
 
-# 🔹 Konfigurasi logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # PUT: Update table pesanan
@@ -28,16 +25,22 @@ def update_order():
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Update table_pesanan
+        # Update + outbox + versi dalam satu transaksi
+        conn.start_transaction()
         query = f"UPDATE table_pesanan SET {column} = %s WHERE id_input = %s"
         cursor.execute(query, (value, id_input))
+        changes = [events.change('table_pesanan', id_input, {column: value})]
+        outbox.stage(cursor, changes)
         
         conn.commit()  
+        events.publish(changes)
 
         logger.info(f"✅ Update berhasil: {column} -> {value} untuk id_input: {id_input}")
 
         return jsonify({'status': 'success', 'message': f'{column} berhasil diperbarui'}), 200
     except Exception as e:
+        if 'conn' in locals() and conn.in_transaction:
+            conn.rollback()
         logger.error(f"❌ Error update pesanan: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
     finally:
@@ -1,9 +1,9 @@
 from flask import Blueprint, request, jsonify
 from project_api.db import get_db_connection
+from project_api import outbox
+from project_api import events
 import logging
 
-# Configure logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 update_urgent_bp = Blueprint('update_urgent_bp', __name__)
@@ -11,6 +11,8 @@ update_urgent_bp = Blueprint('update_urgent_bp', __name__)
 # Endpoint untuk update status_print dan status_produksi ke table_urgent
 @update_urgent_bp.route('/api/update_status_urgent', methods=['PUT'])
 def update_status_urgent():
+    conn = None
+    cursor = None
     try:
         data = request.json
         id_input = data.get("id_input")
@@ -18,6 +20,9 @@ def update_status_urgent():
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        # Kedua update + outbox + versi dalam satu transaksi
+        conn.start_transaction()
+
         # Update status_print dari table_design ke table_urgent
         cursor.execute("""
             UPDATE table_urgent u
@@ -34,9 +39,21 @@ def update_status_urgent():
             WHERE u.id_input = %s
         """, (id_input,))
 
+        # Nilai status terbaru untuk event (satu lookup primary key)
+        cursor.execute("SELECT status_print, status_produksi FROM table_urgent WHERE id_input = %s", (id_input,))
+        row = cursor.fetchone()
+        changes = [events.change('table_urgent', id_input, {"status_print": row[0], "status_produksi": row[1]})] if row else []
+
+        outbox.stage(cursor, changes)
         conn.commit()
-        cursor.close()
-        conn.close()
+        events.publish(changes)
         return jsonify({"message": "Status updated successfully"}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        if conn and conn.in_transaction:
+            conn.rollback()
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
\ No newline at end of file
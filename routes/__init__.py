@@ -7,6 +7,8 @@ from project_api.routes.UPDATE_fromDesigner import update_design_bp
 from project_api.routes.UPDATE_fromProduction import sync_prod_bp
 from project_api.routes.UPDATE_table_urgent import update_urgent_bp
 from project_api.routes.POST_table_urgent import post_urgent_bp
+from project_api.routes.GET_changes import changes_bp
+from project_api.routes.GET_order_board import order_board_bp
 
 
 
@@ -21,3 +23,5 @@ api_bp.register_blueprint(update_design_bp)
 api_bp.register_blueprint(sync_prod_bp)
 api_bp.register_blueprint(update_urgent_bp)
 api_bp.register_blueprint(post_urgent_bp)
+api_bp.register_blueprint(changes_bp)
+api_bp.register_blueprint(order_board_bp)
@@ -0,0 +1,158 @@
+import datetime
+import logging
+import os
+import socket
+import threading
+
+from project_api import events, outbox
+from project_api.db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Interval default promosi order urgent (selain run tepat tengah malam)
+URGENT_INTERVAL_MINUTES = 15
+
+# Interval compaction table_outbox
+OUTBOX_COMPACT_MINUTES = 60
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+def acquire_lease(cursor, job_name, ttl_seconds, owner=WORKER_ID):
+    """
+    Ambil atau perpanjang lease `job_name`. Berhasil jika lease kosong, sudah kedaluwarsa,
+    atau memang milik `owner`. Assignment ON DUPLICATE KEY UPDATE dievaluasi kiri ke kanan,
+    jadi expires_at hanya diperpanjang jika owner sudah menjadi milik kita.
+    """
+    cursor.execute("""
+        INSERT INTO table_job_lease (job_name, owner, expires_at)
+        VALUES (%s, %s, NOW() + INTERVAL %s SECOND)
+        ON DUPLICATE KEY UPDATE
+            owner = IF(expires_at < NOW() OR owner = VALUES(owner), VALUES(owner), owner),
+            expires_at = IF(owner = VALUES(owner), VALUES(expires_at), expires_at)
+    """, (job_name, owner, int(ttl_seconds)))
+    cursor.execute("SELECT owner FROM table_job_lease WHERE job_name = %s", (job_name,))
+    row = cursor.fetchone()
+    return bool(row) and row[0] == owner
+
+
+class PeriodicJob(threading.Thread):
+    """
+    Thread latar yang menjalankan `func(cursor)` setiap `interval` detik (dan tepat setelah
+    tengah malam jika `at_midnight`). Lease DB memastikan hanya satu worker yang menjalankan job;
+    lease berumur dua kali interval supaya pemegangnya tetap sama selama ia hidup.
+
+    Job transactional: `func` mengembalikan daftar perubahan (events.change) yang dicatat ke
+    outbox di transaksi yang sama lalu dikirim lewat events.publish setelah commit.
+    Job non-transactional (mis. compaction) mengatur commit-nya sendiri lewat autocommit.
+    """
+
+    def __init__(self, name, func, interval, at_midnight=True, transactional=True):
+        super().__init__(name=f"job-{name}", daemon=True)
+        self.job_name = name
+        self.func = func
+        self.interval = interval
+        self.at_midnight = at_midnight
+        self.transactional = transactional
+        self._stop_event = threading.Event()
+
+    def _seconds_until_next_run(self):
+        wait = self.interval
+        if self.at_midnight:
+            now = datetime.datetime.now()
+            midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time.min)
+            # Beri jeda 1 detik agar tanggal "hari ini" sudah berganti saat job berjalan
+            wait = min(wait, (midnight - now).total_seconds() + 1)
+        return max(wait, 1)
+
+    def run_once(self):
+        """ Jalankan job sekali jika lease didapat; True jika job benar-benar dijalankan """
+        conn = None
+        cursor = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            if not acquire_lease(cursor, self.job_name, self.interval * 2):
+                logger.debug(f"Lease {self.job_name} dipegang worker lain, dilewati")
+                return False
+
+            if not self.transactional:
+                result = self.func(cursor)
+                logger.info(f"✅ Job {self.job_name} selesai: {result}")
+                return True
+
+            conn.start_transaction()
+            changes = self.func(cursor) or []
+            outbox.stage(cursor, changes)
+            conn.commit()
+            events.publish(changes)
+            logger.info(f"✅ Job {self.job_name} selesai: {len(changes)} perubahan")
+            return True
+        except Exception as e:
+            if conn and conn.in_transaction:
+                conn.rollback()
+            logger.error(f"❌ Job {self.job_name} gagal: {str(e)}")
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+
+    def run(self):
+        logger.info(f"✅ Scheduler {self.job_name} aktif (interval {self.interval} detik, worker {WORKER_ID})")
+        self.run_once()
+        while not self._stop_event.wait(self._seconds_until_next_run()):
+            self.run_once()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def promote_today(cursor):
+    # Import di sini agar scheduler tidak menarik seluruh modul route saat diimport
+    from project_api.routes.POST_table_urgent import promote_urgent_orders, urgent_changes
+    today = datetime.date.today().strftime('%Y-%m-%d')
+    cursor.execute(
+        "SELECT id_input, Platform, qty, Deadline FROM table_input_order WHERE Deadline = %s",
+        (today,)
+    )
+    orders = cursor.fetchall()
+    if not orders:
+        return []
+    promote_urgent_orders(cursor, today)
+    return urgent_changes(orders)
+
+
+def compact_outbox(cursor):
+    return f"{outbox.compact(cursor)} entri outbox dihapus"
+
+
+_jobs = {}
+
+
+def start_urgent_scheduler(interval_minutes=URGENT_INTERVAL_MINUTES):
+    """ Mulai promosi order urgent di latar (idempotent per proses) """
+    job = _jobs.get('urgent_promotion')
+    if job and job.is_alive():
+        return job
+    job = PeriodicJob('urgent_promotion', promote_today, interval_minutes * 60)
+    job.start()
+    _jobs['urgent_promotion'] = job
+    return job
+
+
+def start_outbox_compaction(interval_minutes=OUTBOX_COMPACT_MINUTES):
+    """ Hapus entri table_outbox yang melewati masa retensi secara berkala """
+    job = _jobs.get('outbox_compaction')
+    if job and job.is_alive():
+        return job
+    job = PeriodicJob('outbox_compaction', compact_outbox, interval_minutes * 60,
+                      at_midnight=False, transactional=False)
+    job.start()
+    _jobs['outbox_compaction'] = job
+    return job
+
+
+def stop_all():
+    for job in _jobs.values():
+        job.stop()
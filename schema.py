@@ -0,0 +1,537 @@
+"""
+Skema database versi terkini dan migrasinya.
+
+Semua DDL (tabel inti order, tabel staf, dan tabel pendukung seperti outbox, lease, counter)
+didefinisikan di sini. migrate() menjalankan migrasi yang belum tercatat di
+table_schema_migrations; verify() membandingkan database live dengan key/index/foreign key
+yang diharapkan supaya query panas (id_input, Deadline/deadline, status) tetap index lookup.
+
+    python -m project_api.schema status|verify|migrate
+"""
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaError(RuntimeError):
+    """ Migrasi tidak bisa diterapkan dengan aman (mis. duplikat id_input atau baris yatim) """
+
+
+# ----------------------------------------------------------------------
+# Tabel inti order
+# ----------------------------------------------------------------------
+INPUT_ORDER_DDL = """
+    CREATE TABLE IF NOT EXISTS table_input_order (
+        id_input VARCHAR(32) NOT NULL PRIMARY KEY,
+        TimeTemp DATETIME NULL,
+        id_pesanan VARCHAR(64) NOT NULL,
+        id_admin VARCHAR(32) NULL,
+        Platform VARCHAR(64) NULL,
+        qty INT NULL,
+        nama_ket TEXT NULL,
+        link TEXT NULL,
+        Deadline DATE NULL,
+        KEY idx_input_order_deadline (Deadline),
+        KEY idx_input_order_timetemp (TimeTemp, id_input)
+    )
+"""
+
+PESANAN_DDL = """
+    CREATE TABLE IF NOT EXISTS table_pesanan (
+        id_input VARCHAR(32) NOT NULL PRIMARY KEY,
+        id_pesanan VARCHAR(64) NULL,
+        platform VARCHAR(64) NULL,
+        id_admin VARCHAR(32) NULL,
+        qty INT NULL,
+        deadline DATE NULL,
+        id_desainer VARCHAR(32) NULL,
+        timestamp_designer DATETIME NULL,
+        id_penjahit VARCHAR(32) NULL,
+        timestamp_penjahit DATETIME NULL,
+        id_qc VARCHAR(32) NULL,
+        timestamp_qc DATETIME NULL,
+        desainer VARCHAR(64) NULL,
+        penjahit VARCHAR(64) NULL,
+        qc VARCHAR(64) NULL,
+        layout_link TEXT NULL,
+        status_print VARCHAR(32) NULL,
+        status_produksi VARCHAR(32) NULL,
+        KEY idx_pesanan_deadline (deadline, id_input),
+        KEY idx_pesanan_status_print (status_print),
+        KEY idx_pesanan_status_produksi (status_produksi),
+        CONSTRAINT fk_pesanan_input_order FOREIGN KEY (id_input)
+            REFERENCES table_input_order (id_input) ON DELETE CASCADE
+    )
+"""
+
+DESIGN_DDL = """
+    CREATE TABLE IF NOT EXISTS table_design (
+        id_input VARCHAR(32) NOT NULL PRIMARY KEY,
+        id_designer VARCHAR(32) NULL,
+        platform VARCHAR(64) NULL,
+        qty INT NULL,
+        layout_link TEXT NULL,
+        deadline DATE NULL,
+        status_print VARCHAR(32) NULL,
+        timestamp DATETIME NULL,
+        KEY idx_design_deadline (deadline, id_input),
+        KEY idx_design_status_print (status_print),
+        CONSTRAINT fk_design_input_order FOREIGN KEY (id_input)
+            REFERENCES table_input_order (id_input) ON DELETE CASCADE
+    )
+"""
+
+PROD_DDL = """
+    CREATE TABLE IF NOT EXISTS table_prod (
+        id_input VARCHAR(32) NOT NULL PRIMARY KEY,
+        platform VARCHAR(64) NULL,
+        qty INT NULL,
+        deadline DATE NULL,
+        id_penjahit VARCHAR(32) NULL,
+        id_qc VARCHAR(32) NULL,
+        status_print VARCHAR(32) NULL,
+        status_produksi VARCHAR(32) NULL,
+        timestamp DATETIME NULL,
+        KEY idx_prod_deadline (deadline, id_input),
+        KEY idx_prod_status_produksi (status_produksi),
+        CONSTRAINT fk_prod_input_order FOREIGN KEY (id_input)
+            REFERENCES table_input_order (id_input) ON DELETE CASCADE
+    )
+"""
+
+URGENT_DDL = """
+    CREATE TABLE IF NOT EXISTS table_urgent (
+        id_input VARCHAR(32) NOT NULL PRIMARY KEY,
+        platform VARCHAR(64) NULL,
+        qty INT NULL,
+        deadline DATE NULL,
+        status_print VARCHAR(32) NULL,
+        status_produksi VARCHAR(32) NULL,
+        KEY idx_urgent_deadline (deadline, id_input),
+        KEY idx_urgent_status (status_print, status_produksi),
+        CONSTRAINT fk_urgent_input_order FOREIGN KEY (id_input)
+            REFERENCES table_input_order (id_input) ON DELETE CASCADE
+    )
+"""
+
+# Tabel staf untuk data referensi nama (dibaca reference_cache)
+STAFF_DDL = """
+    CREATE TABLE IF NOT EXISTS `{table}` (
+        ID VARCHAR(32) NOT NULL PRIMARY KEY,
+        Nama VARCHAR(128) NOT NULL
+    )
+"""
+STAFF_TABLES = ['table_desainer', 'table_penjahit', 'table_qc', 'table_kurir', 'table_admin']
+
+# ----------------------------------------------------------------------
+# Tabel pendukung (dibuat migrasi atau ensure_aux_tables saat startup, tidak pernah di jalur request)
+# ----------------------------------------------------------------------
+
+# Counter perubahan per tabel; di-bump di transaksi yang sama dengan mutasinya
+VERSIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+        version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+# Counter nomor urut id_input per bulan (period = MMYY)
+COUNTER_DDL = """
+    CREATE TABLE IF NOT EXISTS table_id_counter (
+        period CHAR(4) NOT NULL PRIMARY KEY,
+        last_value INT UNSIGNED NOT NULL DEFAULT 0
+    )
+"""
+
+# High-water mark sync incremental: (TimeTemp, id_input) baris terakhir yang sudah disinkronkan
+SYNC_STATE_DDL = """
+    CREATE TABLE IF NOT EXISTS table_sync_state (
+        sync_name VARCHAR(64) NOT NULL PRIMARY KEY,
+        last_time DATETIME NULL,
+        last_id VARCHAR(32) NULL,
+        last_full_at DATETIME NULL,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+# Lease per job: hanya satu worker (pemegang lease) yang menjalankan job
+LEASE_DDL = """
+    CREATE TABLE IF NOT EXISTS table_job_lease (
+        job_name VARCHAR(64) NOT NULL PRIMARY KEY,
+        owner VARCHAR(128) NOT NULL,
+        expires_at DATETIME NOT NULL
+    )
+"""
+
+# Log perubahan append-only; seq menjadi cursor untuk /api/changes?since=
+OUTBOX_DDL = """
+    CREATE TABLE IF NOT EXISTS table_outbox (
+        seq BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        table_name VARCHAR(64) NOT NULL,
+        id_input VARCHAR(32) NULL,
+        action VARCHAR(16) NOT NULL,
+        fields TEXT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        KEY idx_outbox_created_at (created_at)
+    )
+"""
+
+# Satu baris: seq tertinggi yang sudah dihapus compaction (batas 410 untuk /api/changes)
+OUTBOX_STATE_DDL = """
+    CREATE TABLE IF NOT EXISTS table_outbox_state (
+        id TINYINT UNSIGNED NOT NULL PRIMARY KEY,
+        compacted_seq BIGINT UNSIGNED NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS table_schema_migrations (
+        version INT UNSIGNED NOT NULL PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Urutan pembuatan: tabel induk sebelum tabel dengan foreign key
+CORE_TABLES = [
+    ('table_input_order', INPUT_ORDER_DDL),
+    ('table_pesanan', PESANAN_DDL),
+    ('table_design', DESIGN_DDL),
+    ('table_prod', PROD_DDL),
+    ('table_urgent', URGENT_DDL),
+]
+AUX_TABLES = [
+    ('table_versions', VERSIONS_DDL),
+    ('table_id_counter', COUNTER_DDL),
+    ('table_sync_state', SYNC_STATE_DDL),
+    ('table_job_lease', LEASE_DDL),
+    ('table_outbox', OUTBOX_DDL),
+    ('table_outbox_state', OUTBOX_STATE_DDL),
+]
+
+# ----------------------------------------------------------------------
+# Key/index yang diharapkan (juga diterapkan ke tabel lama yang dibuat di luar modul ini)
+# ----------------------------------------------------------------------
+ORDER_TABLES = [table for table, _ in CORE_TABLES]
+
+# (tabel, nama index, kolom)
+SECONDARY_INDEXES = [
+    ('table_input_order', 'idx_input_order_deadline', ('Deadline',)),
+    ('table_input_order', 'idx_input_order_timetemp', ('TimeTemp', 'id_input')),
+    ('table_pesanan', 'idx_pesanan_deadline', ('deadline', 'id_input')),
+    ('table_pesanan', 'idx_pesanan_status_print', ('status_print',)),
+    ('table_pesanan', 'idx_pesanan_status_produksi', ('status_produksi',)),
+    ('table_design', 'idx_design_deadline', ('deadline', 'id_input')),
+    ('table_design', 'idx_design_status_print', ('status_print',)),
+    ('table_prod', 'idx_prod_deadline', ('deadline', 'id_input')),
+    ('table_prod', 'idx_prod_status_produksi', ('status_produksi',)),
+    ('table_urgent', 'idx_urgent_deadline', ('deadline', 'id_input')),
+    ('table_urgent', 'idx_urgent_status', ('status_print', 'status_produksi')),
+]
+
+# (tabel anak, nama constraint); semuanya id_input -> table_input_order.id_input ON DELETE CASCADE
+FOREIGN_KEYS = [
+    ('table_pesanan', 'fk_pesanan_input_order'),
+    ('table_design', 'fk_design_input_order'),
+    ('table_prod', 'fk_prod_input_order'),
+    ('table_urgent', 'fk_urgent_input_order'),
+]
+
+
+# ----------------------------------------------------------------------
+# Introspeksi
+# ----------------------------------------------------------------------
+def _rows(cursor, query, params=()):
+    cursor.execute(query, params)
+    return [tuple(row.values()) if isinstance(row, dict) else tuple(row) for row in cursor.fetchall()]
+
+
+def existing_tables(cursor):
+    return {row[0] for row in _rows(cursor, """
+        SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()
+    """)}
+
+
+def table_indexes(cursor, table):
+    """ {nama index: (unique, (kolom, ...))} """
+    indexes = {}
+    for name, non_unique, column in _rows(cursor, """
+        SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (table,)):
+        unique, columns = indexes.get(name, (not non_unique, ()))
+        indexes[name] = (unique, columns + (column,))
+    return indexes
+
+
+def has_id_key(indexes):
+    """ id_input sendiri menjadi PRIMARY/UNIQUE key """
+    return any(unique and columns == ('id_input',) for unique, columns in indexes.values())
+
+
+def has_index_on(indexes, columns):
+    """ Ada index yang diawali `columns` (index dengan prefix yang sama juga dipakai optimizer) """
+    return any(existing[:len(columns)] == tuple(columns) for _, existing in indexes.values())
+
+
+def foreign_keys(cursor, table):
+    """ {nama constraint: (tabel induk, delete rule)} untuk kolom id_input """
+    return {name: (parent, rule) for name, parent, rule in _rows(cursor, """
+        SELECT rc.CONSTRAINT_NAME, rc.REFERENCED_TABLE_NAME, rc.DELETE_RULE
+        FROM information_schema.REFERENTIAL_CONSTRAINTS rc
+        JOIN information_schema.KEY_COLUMN_USAGE k
+            ON k.CONSTRAINT_SCHEMA = rc.CONSTRAINT_SCHEMA AND k.CONSTRAINT_NAME = rc.CONSTRAINT_NAME
+            AND k.TABLE_NAME = rc.TABLE_NAME
+        WHERE rc.CONSTRAINT_SCHEMA = DATABASE() AND rc.TABLE_NAME = %s AND k.COLUMN_NAME = 'id_input'
+    """, (table,))}
+
+
+def column_definition(cursor, table, column='id_input'):
+    """ (COLUMN_TYPE, charset, collation, nullable) kolom live, atau None jika kolom tidak ada """
+    rows = _rows(cursor, """
+        SELECT COLUMN_TYPE, CHARACTER_SET_NAME, COLLATION_NAME, IS_NULLABLE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    if not rows:
+        return None
+    column_type, charset, collation, nullable = rows[0]
+    return column_type, charset, collation, nullable == 'YES'
+
+
+def verify(cursor):
+    """
+    Bandingkan database live dengan skema yang diharapkan.
+    Mengembalikan list masalah (string); list kosong berarti skema lengkap.
+    """
+    problems = []
+    tables = existing_tables(cursor)
+    for table in ORDER_TABLES:
+        if table not in tables:
+            problems.append(f"{table}: tabel tidak ada")
+            continue
+        indexes = table_indexes(cursor, table)
+        if not has_id_key(indexes):
+            problems.append(f"{table}: tidak ada PRIMARY/UNIQUE key pada id_input")
+
+    for table, name, columns in SECONDARY_INDEXES:
+        if table in tables and not has_index_on(table_indexes(cursor, table), columns):
+            problems.append(f"{table}: tidak ada index pada ({', '.join(columns)}) [{name}]")
+
+    if 'table_input_order' in tables:
+        for table, name in FOREIGN_KEYS:
+            if table not in tables:
+                continue
+            fks = foreign_keys(cursor, table)
+            if not any(parent == 'table_input_order' for parent, _ in fks.values()):
+                problems.append(f"{table}: tidak ada foreign key id_input -> table_input_order [{name}]")
+
+    for table, _ in AUX_TABLES:
+        if table not in tables:
+            problems.append(f"{table}: tabel pendukung tidak ada")
+
+    return problems
+
+
+# ----------------------------------------------------------------------
+# Langkah migrasi (idempotent: aman diulang di database yang sebagian sudah sesuai)
+# ----------------------------------------------------------------------
+def create_tables(cursor):
+    for _, ddl in CORE_TABLES + AUX_TABLES:
+        cursor.execute(ddl)
+    for table in STAFF_TABLES:
+        cursor.execute(STAFF_DDL.format(table=table))
+
+
+def ensure_aux_tables(cursor):
+    """
+    Buat tabel pendukung yang belum ada. DDL MySQL melakukan implicit commit, jadi ini hanya
+    dipanggil dari migrasi atau saat startup di koneksi sendiri, bukan di dalam transaksi request.
+    """
+    for _, ddl in AUX_TABLES:
+        cursor.execute(ddl)
+
+
+def ensure_id_keys(cursor):
+    """ PRIMARY KEY (atau UNIQUE jika PK sudah dipakai kolom lain) pada id_input """
+    for table in ORDER_TABLES:
+        indexes = table_indexes(cursor, table)
+        if has_id_key(indexes):
+            continue
+        duplicate = _rows(cursor, f"SELECT id_input FROM {table} GROUP BY id_input HAVING COUNT(*) > 1 LIMIT 1")
+        if duplicate:
+            raise SchemaError(f"{table} berisi id_input duplikat (mis. {duplicate[0][0]!r}); bersihkan dulu")
+        if 'PRIMARY' in indexes:
+            cursor.execute(f"ALTER TABLE {table} ADD UNIQUE KEY uk_{table[6:]}_id_input (id_input)")
+        else:
+            definition = column_definition(cursor, table)
+            if definition is None:
+                raise SchemaError(f"{table} tidak punya kolom id_input")
+            column_type, charset, collation, nullable = definition
+            if not nullable:
+                cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id_input)")
+            else:
+                if _rows(cursor, f"SELECT 1 FROM {table} WHERE id_input IS NULL LIMIT 1"):
+                    raise SchemaError(f"{table} berisi id_input NULL; isi atau hapus dulu")
+                # PRIMARY KEY butuh NOT NULL; tipe, charset dan collation live dipertahankan
+                charset_clause = f" CHARACTER SET {charset} COLLATE {collation}" if charset else ""
+                cursor.execute(f"ALTER TABLE {table} MODIFY id_input {column_type}{charset_clause} NOT NULL, "
+                               "ADD PRIMARY KEY (id_input)")
+        logger.info(f"✅ Key id_input ditambahkan ke {table}")
+
+
+def ensure_secondary_indexes(cursor):
+    by_table = {}
+    for table, name, columns in SECONDARY_INDEXES:
+        by_table.setdefault(table, []).append((name, columns))
+    for table, wanted in by_table.items():
+        indexes = table_indexes(cursor, table)
+        missing = [(name, columns) for name, columns in wanted
+                   if not has_index_on(indexes, columns) and name not in indexes]
+        if missing:
+            # Satu ALTER per tabel: tabel hanya dibangun ulang sekali
+            cursor.execute(f"ALTER TABLE {table} " + ", ".join(
+                f"ADD INDEX {name} ({', '.join(columns)})" for name, columns in missing))
+            logger.info(f"✅ Index {', '.join(name for name, _ in missing)} ditambahkan ke {table}")
+
+
+def ensure_foreign_keys(cursor):
+    for table, name in FOREIGN_KEYS:
+        fks = foreign_keys(cursor, table)
+        if any(parent == 'table_input_order' for parent, _ in fks.values()):
+            continue
+        orphan = _rows(cursor, f"""
+            SELECT c.id_input FROM {table} c
+            LEFT JOIN table_input_order i ON i.id_input = c.id_input
+            WHERE i.id_input IS NULL LIMIT 1
+        """)
+        if orphan:
+            raise SchemaError(f"{table} berisi id_input tanpa induk di table_input_order "
+                              f"(mis. {orphan[0][0]!r}); hapus atau lengkapi dulu")
+        child, parent = column_definition(cursor, table), column_definition(cursor, 'table_input_order')
+        if child and parent and child[:3] != parent[:3]:
+            raise SchemaError(f"{table}.id_input ({' '.join(filter(None, child[:3]))}) tidak sama dengan "
+                              f"table_input_order.id_input ({' '.join(filter(None, parent[:3]))}); "
+                              f"samakan tipe/collation dulu")
+        cursor.execute(f"""
+            ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (id_input)
+            REFERENCES table_input_order (id_input) ON DELETE CASCADE
+        """)
+        logger.info(f"✅ Foreign key {name} ditambahkan ke {table}")
+
+
+# (versi, deskripsi, fungsi); versi baru selalu ditambahkan di akhir
+MIGRATIONS = [
+    (1, 'Buat tabel order, staf dan tabel pendukung', create_tables),
+    (2, 'PRIMARY/UNIQUE key id_input di tabel order', ensure_id_keys),
+    (3, 'Index deadline/Deadline, TimeTemp dan status', ensure_secondary_indexes),
+    (4, 'Foreign key id_input -> table_input_order ON DELETE CASCADE', ensure_foreign_keys),
+    (5, 'Tabel pendukung (versions, id counter, sync state, job lease, outbox)', ensure_aux_tables),
+    (6, 'Watermark compaction outbox (table_outbox_state)', ensure_aux_tables),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(cursor):
+    """ Versi skema tercatat; read-only (0 jika table_schema_migrations belum ada) """
+    if 'table_schema_migrations' not in existing_tables(cursor):
+        return 0
+    rows = _rows(cursor, "SELECT COALESCE(MAX(version), 0) FROM table_schema_migrations")
+    return int(rows[0][0])
+
+
+def migrate(cursor, target=SCHEMA_VERSION):
+    """
+    Jalankan migrasi yang belum diterapkan sampai `target`. DDL MySQL auto-commit,
+    jadi setiap migrasi dicatat segera setelah berhasil; migrasi yang gagal diulang penuh
+    pada run berikutnya. Mengembalikan list versi yang diterapkan.
+    """
+    applied = []
+    cursor.execute(MIGRATIONS_DDL)
+    version = current_version(cursor)
+    for number, description, step in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        logger.info(f"Migrasi {number}: {description}")
+        step(cursor)
+        cursor.execute("INSERT INTO table_schema_migrations (version, description) VALUES (%s, %s)",
+                       (number, description))
+        applied.append(number)
+    return applied
+
+
+def ensure_aux_tables_on_startup():
+    """ Dipanggil create_app sebelum scheduler dan request pertama; koneksi autocommit sendiri """
+    from project_api.db import get_db_connection
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        ensure_aux_tables(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def check_on_startup(auto_migrate=False):
+    """ Dipanggil create_app: log masalah skema (dan migrasi jika diizinkan) """
+    from project_api.db import get_db_connection
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        if auto_migrate:
+            applied = migrate(cursor)
+            if applied:
+                logger.info(f"✅ Migrasi diterapkan: {applied}")
+        problems = verify(cursor)
+        version = current_version(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+    if problems:
+        logger.warning(f"⚠️ Skema database v{version} (terbaru v{SCHEMA_VERSION}) belum lengkap; "
+                       f"jalankan `python -m project_api.schema migrate`:\n  - " + "\n  - ".join(problems))
+    else:
+        logger.info(f"✅ Skema database v{version} terverifikasi")
+    return problems
+
+
+def main(argv=None):
+    from project_api.db import get_db_connection
+
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else 'status'
+    if command not in ('status', 'verify', 'migrate'):
+        print("Penggunaan: python -m project_api.schema status|verify|migrate")
+        return 2
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        if command == 'migrate':
+            applied = migrate(cursor)
+            print(f"Migrasi diterapkan: {applied or 'tidak ada'}")
+        print(f"Versi skema: {current_version(cursor)} (terbaru {SCHEMA_VERSION})")
+        if command in ('verify', 'migrate'):
+            problems = verify(cursor)
+            for problem in problems:
+                print(f"  - {problem}")
+            print("Skema lengkap" if not problems else f"{len(problems)} masalah")
+            return 1 if problems else 0
+        return 0
+    except SchemaError as e:
+        print(f"Migrasi berhenti: {e}")
+        return 1
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+
+from project_api.db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaCatalog:
+    """
+    Cache metadata kolom untuk semua tabel `table_*`.
+    Dimuat sekali dengan satu query ke information_schema, lalu dilayani dari memori
+    sampai TTL habis atau invalidate() dipanggil.
+    """
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._tables = {}  # nama tabel -> list kolom (urutan ordinal)
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _expired(self):
+        return self._loaded_at is None or (self.ttl and time.monotonic() - self._loaded_at > self.ttl)
+
+    def _load(self, cursor=None):
+        conn = None
+        own_cursor = cursor is None
+        try:
+            if own_cursor:
+                conn = get_db_connection()
+                cursor = conn.cursor()
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE 'table\\_%'
+                ORDER BY TABLE_NAME, ORDINAL_POSITION
+            """)
+            tables = {}
+            for row in cursor.fetchall():
+                # Cursor pemanggil bisa berupa cursor dictionary
+                table_name, column_name = row.values() if isinstance(row, dict) else row
+                tables.setdefault(table_name, []).append(column_name)
+        finally:
+            if own_cursor:
+                if cursor:
+                    cursor.close()
+                if conn:
+                    conn.close()
+
+        self._tables = tables
+        self._loaded_at = time.monotonic()
+        logger.info(f"✅ Schema catalog dimuat: {len(tables)} tabel")
+
+    def refresh(self, cursor=None):
+        with self._lock:
+            self._load(cursor)
+
+    def invalidate(self):
+        """ Paksa reload pada lookup berikutnya (mis. setelah ALTER TABLE) """
+        with self._lock:
+            self._loaded_at = None
+
+    def columns(self, table_name, cursor=None):
+        """ Daftar kolom `table_name`; list kosong jika tabel tidak dikenal """
+        if self._expired():
+            with self._lock:
+                if self._expired():
+                    self._load(cursor)
+        return list(self._tables.get(table_name, []))
+
+    def tables(self, cursor=None):
+        if self._expired():
+            with self._lock:
+                if self._expired():
+                    self._load(cursor)
+        return sorted(self._tables)
+
+    def has_table(self, table_name, cursor=None):
+        return table_name in self.tables(cursor)
+
+    def invalid_columns(self, table_name, names, cursor=None):
+        """ Nama di `names` yang bukan kolom `table_name` (whitelist) """
+        valid = set(self.columns(table_name, cursor))
+        return [name for name in names if name not in valid]
+
+
+# Instance bersama untuk seluruh aplikasi
+catalog = SchemaCatalog()
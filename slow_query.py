@@ -0,0 +1,194 @@
+import logging
+import queue
+import re
+import threading
+import time
+
+import mysql.connector
+from flask import jsonify, request
+
+from project_api.db import DB_CONFIG, add_pool_listener
+
+logger = logging.getLogger(__name__)
+
+# Query lebih lambat dari ini dicatat (ms); bisa diubah lewat create_app(SLOW_QUERY_MS=...)
+SLOW_QUERY_MS = 200
+
+# Jumlah statement ter-normalisasi yang disimpan (yang total waktunya paling kecil dibuang)
+MAX_ENTRIES = 200
+
+# Plan EXPLAIN di-capture ulang jika sudah lebih tua dari ini
+EXPLAIN_REFRESH_SECONDS = 600
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'INSERT', 'REPLACE')
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(statement):
+    """ Teks statement tanpa literal, whitespace dirapatkan; IN (%s, %s, ...) jadi IN (...) """
+    if isinstance(statement, (bytes, bytearray)):
+        statement = statement.decode(errors='replace')
+    text = _WHITESPACE.sub(' ', statement).strip()
+    text = _STRING_LITERAL.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    return _PLACEHOLDER_LIST.sub('(...)', text)
+
+
+def _param_count(params):
+    if params is None:
+        return 0
+    if isinstance(params, dict):
+        return len(params)
+    try:
+        return len(params)
+    except TypeError:
+        return 1
+
+
+class SlowQueryLog:
+    """
+    Listener pool yang mencatat query di atas `threshold_ms` per statement ter-normalisasi
+    (jumlah, total/maks durasi, jumlah parameter, rows) dan meng-capture EXPLAIN-nya.
+    EXPLAIN dijalankan di thread latar dengan koneksi tersendiri (di luar pool dan
+    instrumentasi), jadi request yang lambat tidak ditambah beban lagi.
+    """
+
+    def __init__(self, threshold_ms=SLOW_QUERY_MS, max_entries=MAX_ENTRIES, explain=True):
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        self.explain = explain
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._explain_queue = queue.Queue(maxsize=100)
+        self._explain_thread = None
+
+    # Listener pool ------------------------------------------------------
+    def on_query(self, operation, params, seconds, cursor):
+        duration_ms = seconds * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        text = normalize(operation)
+        rows = getattr(cursor, 'rowcount', -1)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(text)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    self._evict()
+                entry = self._entries[text] = {
+                    'statement': text,
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'explain': None,
+                    'explained_at': None,
+                }
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['last_ms'] = round(duration_ms, 1)
+            entry['last_rows'] = rows
+            entry['param_count'] = _param_count(params)
+            entry['last_seen'] = now
+            needs_plan = self.explain and (entry['explained_at'] is None
+                                           or now - entry['explained_at'] > EXPLAIN_REFRESH_SECONDS)
+            if needs_plan:
+                entry['explained_at'] = now
+
+        logger.warning(f"🐢 Slow query {duration_ms:.1f} ms (rows {rows}, {_param_count(params)} param): {text}")
+        if needs_plan and text.split(' ', 1)[0].upper() in EXPLAINABLE:
+            self._queue_explain(text, operation, params)
+
+    def _evict(self):
+        victim = min(self._entries.values(), key=lambda item: item['total_ms'])
+        del self._entries[victim['statement']]
+
+    # EXPLAIN di latar -----------------------------------------------------
+    def _queue_explain(self, text, operation, params):
+        if self._explain_thread is None or not self._explain_thread.is_alive():
+            with self._lock:
+                if self._explain_thread is None or not self._explain_thread.is_alive():
+                    self._explain_thread = threading.Thread(
+                        target=self._explain_worker, name="slow-query-explain", daemon=True)
+                    self._explain_thread.start()
+        try:
+            self._explain_queue.put_nowait((text, operation, params))
+        except queue.Full:
+            logger.debug("Antrian EXPLAIN penuh, plan dilewati")
+
+    def _explain_worker(self):
+        conn = None
+        while True:
+            text, operation, params = self._explain_queue.get()
+            try:
+                if conn is None or not conn.is_connected():
+                    conn = mysql.connector.connect(**DB_CONFIG)
+                cursor = conn.cursor(dictionary=True)
+                try:
+                    cursor.execute(f"EXPLAIN {operation}", params or ())
+                    plan = cursor.fetchall()
+                finally:
+                    cursor.close()
+                    if conn.in_transaction:
+                        conn.rollback()
+            except Exception as e:
+                plan = [{'error': str(e)}]
+                conn = None
+            with self._lock:
+                entry = self._entries.get(text)
+                if entry is not None:
+                    entry['explain'] = plan
+
+    # Laporan --------------------------------------------------------------
+    def top(self, limit=20, sort='total_ms'):
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        entries.sort(key=lambda item: item[sort], reverse=True)
+        for entry in entries:
+            entry['avg_ms'] = round(entry['total_ms'] / entry['count'], 1)
+            entry['total_ms'] = round(entry['total_ms'], 1)
+            entry['max_ms'] = round(entry['max_ms'], 1)
+        return entries[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._entries = {}
+
+    def init_app(self, app, endpoints=False):
+        """
+        Pasang listener pool. Route /debug/slow-queries (teks SQL, EXPLAIN, reset) hanya
+        didaftarkan jika `endpoints` True (config DEBUG_ENDPOINTS), karena tidak dilindungi auth.
+        """
+        add_pool_listener(self)
+        if not endpoints:
+            return
+
+        # GET: statement paling lambat (?sort=total_ms|max_ms|count, ?limit=n)
+        @app.route('/debug/slow-queries', methods=['GET'])
+        def slow_queries():
+            sort = request.args.get('sort', 'total_ms')
+            if sort not in ('total_ms', 'max_ms', 'count'):
+                return jsonify({'status': 'error', 'message': 'sort harus total_ms, max_ms atau count'}), 400
+            try:
+                limit = max(1, int(request.args.get('limit', 20)))
+            except ValueError:
+                return jsonify({'status': 'error', 'message': 'Parameter limit harus berupa angka'}), 400
+            return jsonify({
+                'status': 'success',
+                'threshold_ms': self.threshold_ms,
+                'data': self.top(limit, sort),
+            }), 200
+
+        # DELETE: kosongkan log (mis. setelah menambah index)
+        @app.route('/debug/slow-queries', methods=['DELETE'])
+        def reset_slow_queries():
+            self.reset()
+            return jsonify({'status': 'success', 'message': 'Slow-query log dikosongkan'}), 200
+
+
+# Instance bersama untuk seluruh aplikasi
+slow_query_log = SlowQueryLog()
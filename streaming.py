@@ -0,0 +1,99 @@
+import logging
+import time
+
+from flask import Response, current_app, stream_with_context
+
+from project_api.db import get_db_connection
+from project_api.listing import ListingError
+
+logger = logging.getLogger(__name__)
+
+# Jumlah baris per fetchmany dari cursor unbuffered
+FETCH_BATCH = 500
+
+STREAM_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def wants_stream(args):
+    """ Format stream dari ?stream=json|ndjson, None jika tidak diminta """
+    fmt = args.get('stream')
+    if fmt is None:
+        return None
+    fmt = fmt.lower() or 'json'
+    if fmt in ('1', 'true'):
+        fmt = 'json'
+    if fmt not in STREAM_FORMATS:
+        raise ListingError(f"Format stream tidak dikenal: {fmt} (gunakan json atau ndjson)")
+    return fmt
+
+
+def stream_query(query, params=None, fmt='json', key='data', envelope=None, transform=None):
+    """
+    Jalankan `query` dan kirim hasilnya bertahap tanpa menampung seluruh tabel di memori.
+
+    - json  : {<envelope...>, "<key>": [row, row, ...]} dikirim chunked
+    - ndjson: satu baris JSON per row
+
+    Query dieksekusi sebelum response dibuat sehingga error SQL masih bisa dijawab 500;
+    setelah header terkirim, error hanya bisa dicatat di log.
+    Cursor unbuffered menghabiskan waktunya di fetchmany, jadi durasi execute + seluruh fetch
+    dilaporkan ke listener pool (metrics, slow-query log) sebagai satu query saat stream selesai.
+    """
+    conn = get_db_connection()
+    started = time.perf_counter()
+    try:
+        cursor = conn.cursor(dictionary=True, buffered=False, instrument=False)
+        cursor.execute(query, params or ())
+    except Exception:
+        conn.discard()
+        raise
+
+    dumps = current_app.json.dumps
+    state = {'done': False, 'db_seconds': time.perf_counter() - started}
+
+    def generate():
+        if fmt == 'json':
+            if envelope:
+                yield dumps(envelope)[:-1] + ',' + dumps(key) + ':['
+            else:
+                yield '{' + dumps(key) + ':['
+
+        first = True
+        while True:
+            fetch_started = time.perf_counter()
+            batch = cursor.fetchmany(FETCH_BATCH)
+            state['db_seconds'] += time.perf_counter() - fetch_started
+            if not batch:
+                break
+            if transform:
+                batch = [transform(row) for row in batch]
+            if fmt == 'ndjson':
+                yield ''.join(dumps(row) + '\n' for row in batch)
+            else:
+                chunk = ','.join(dumps(row) for row in batch)
+                yield chunk if first else ',' + chunk
+                first = False
+
+        if fmt == 'json':
+            yield ']}'
+        state['done'] = True
+
+    def cleanup():
+        conn.report_query(query, params, state['db_seconds'], cursor)
+        # Cursor unbuffered yang belum habis dibaca meninggalkan koneksi kotor: buang saja
+        if state['done']:
+            try:
+                cursor.close()
+            finally:
+                conn.close()
+        else:
+            logger.warning("⚠️ Stream dihentikan sebelum selesai, koneksi dibuang")
+            conn.discard()
+
+    response = Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[fmt])
+    response.headers['X-Accel-Buffering'] = 'no'  # Jangan di-buffer oleh reverse proxy
+    response.call_on_close(cleanup)
+    return response
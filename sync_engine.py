@@ -0,0 +1,298 @@
+import logging
+import time
+
+from project_api.db import get_db_connection
+from project_api import outbox
+
+logger = logging.getLogger(__name__)
+
+# Jumlah id_input per chunk (satu transaksi per chunk)
+SYNC_CHUNK_SIZE = 1000
+
+# Mode incremental tetap menjalankan full scan jika full sync terakhir lebih lama dari ini
+FULL_SYNC_INTERVAL = 3600  # detik
+
+SYNC_NAME = 'input_order_to_pesanan'
+
+# Rekonsiliasi table_input_order -> table_pesanan dalam satu statement set-based.
+# Kolom milik desainer/produksi (layout_link, status_*, id_desainer, ...) tidak ditimpa
+# saat baris sudah ada; status hanya diisi default untuk baris baru.
+UPSERT_PESANAN_SQL = """
+    INSERT INTO table_pesanan
+        (id_pesanan, id_input, platform, id_admin, qty, deadline, status_print, status_produksi)
+    SELECT i.id_pesanan, i.id_input, i.Platform, i.id_admin, i.qty, i.Deadline, '-', '-'
+    FROM table_input_order i
+    WHERE {where}
+    ON DUPLICATE KEY UPDATE
+        id_pesanan = VALUES(id_pesanan),
+        platform = VALUES(platform),
+        id_admin = VALUES(id_admin),
+        qty = VALUES(qty),
+        deadline = VALUES(deadline)
+"""
+
+# Hitung baris baru dan baris yang benar-benar berbeda di rentang yang sama sebelum upsert.
+# rowcount upsert tidak bisa dipakai: tanpa CLIENT_FOUND_ROWS baris identik dihitung 0.
+COUNT_RANGE_SQL = """
+    SELECT
+        COALESCE(SUM(p.id_input IS NULL), 0),
+        COALESCE(SUM(p.id_input IS NOT NULL AND NOT (
+            p.id_pesanan <=> i.id_pesanan AND p.platform <=> i.Platform AND p.id_admin <=> i.id_admin
+            AND p.qty <=> i.qty AND p.deadline <=> i.Deadline
+        )), 0)
+    FROM table_input_order i
+    LEFT JOIN table_pesanan p ON p.id_input = i.id_input
+    WHERE {where}
+"""
+
+
+def load_state(cursor):
+    """ Watermark tersimpan: dict last_time, last_id, full_age (detik sejak full sync) atau None """
+    cursor.execute("""
+        SELECT last_time, last_id, TIMESTAMPDIFF(SECOND, last_full_at, NOW())
+        FROM table_sync_state WHERE sync_name = %s
+    """, (SYNC_NAME,))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    return {'last_time': row[0], 'last_id': row[1], 'full_age': row[2]}
+
+
+def save_state(cursor, last_time, last_id, full=False):
+    cursor.execute("""
+        INSERT INTO table_sync_state (sync_name, last_time, last_id, last_full_at)
+        VALUES (%s, %s, %s, IF(%s, NOW(), NULL))
+        ON DUPLICATE KEY UPDATE
+            last_time = VALUES(last_time),
+            last_id = VALUES(last_id),
+            last_full_at = IF(%s, NOW(), last_full_at)
+    """, (SYNC_NAME, last_time, last_id, full, full))
+
+
+def _current_watermark(cursor):
+    """ (TimeTemp, id_input) terbaru di table_input_order """
+    cursor.execute("""
+        SELECT TimeTemp, id_input FROM table_input_order
+        WHERE TimeTemp IS NOT NULL
+        ORDER BY TimeTemp DESC, id_input DESC LIMIT 1
+    """)
+    row = cursor.fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def sync_one(cursor, id_input):
+    """ Sinkronkan satu id_input; False jika tidak ada di table_input_order """
+    cursor.execute(UPSERT_PESANAN_SQL.format(where="i.id_input = %s"), (id_input,))
+    if cursor.rowcount > 0:
+        return True
+    # rowcount 0 juga berarti baris table_pesanan sudah identik (koneksi tanpa CLIENT_FOUND_ROWS)
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM table_input_order WHERE id_input = %s) AS found", (id_input,))
+    row = cursor.fetchone()
+    return bool(row["found"] if isinstance(row, dict) else row[0])
+
+
+def _next_upper_bound(cursor, lower, chunk_size):
+    """ id_input terakhir dari chunk berikutnya setelah `lower` (None jika sudah habis) """
+    cursor.execute(
+        "SELECT id_input FROM table_input_order WHERE id_input > %s ORDER BY id_input LIMIT 1 OFFSET %s",
+        (lower, chunk_size - 1)
+    )
+    row = cursor.fetchone()
+    if row:
+        return row[0]
+    # Chunk terakhir yang tidak penuh
+    cursor.execute("SELECT MAX(id_input) FROM table_input_order WHERE id_input > %s", (lower,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def sync_range(cursor, lower, upper):
+    """ Upsert id_input di (lower, upper]; mengembalikan (inserted, updated) """
+    where = "i.id_input > %s AND i.id_input <= %s"
+    cursor.execute(COUNT_RANGE_SQL.format(where=where), (lower, upper))
+    inserted, updated = cursor.fetchone()
+    cursor.execute(UPSERT_PESANAN_SQL.format(where=where), (lower, upper))
+    return int(inserted), int(updated)
+
+
+def sync_all(chunk_size=SYNC_CHUNK_SIZE, on_progress=None):
+    """
+    Rekonsiliasi penuh table_input_order -> table_pesanan per chunk id_input.
+    Tiap chunk satu transaksi; `on_progress(chunk_info)` dipanggil setelah tiap chunk commit.
+    Berhenti di chunk pertama yang gagal (chunk sebelumnya tetap tersimpan).
+    """
+    conn = None
+    cursor = None
+    started = time.monotonic()
+    result = {'success': True, 'inserted': 0, 'updated': 0, 'chunks': 0}
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        # Watermark diambil sebelum scan: baris yang masuk selama full sync ditangkap incremental berikutnya
+        watermark = _current_watermark(cursor)
+
+        lower = ''
+        while True:
+            upper = _next_upper_bound(cursor, lower, chunk_size)
+            if upper is None:
+                break
+
+            conn.start_transaction()
+            try:
+                inserted, updated = sync_range(cursor, lower, upper)
+                # Satu entri per chunk; konsumen /api/changes memuat ulang rentang ini
+                outbox.stage(cursor, [{'table': 'table_pesanan', 'id_input': None, 'action': 'resync',
+                                       'fields': {'from': lower, 'to': upper}}])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            result['chunks'] += 1
+            result['inserted'] += inserted
+            result['updated'] += updated
+            chunk_info = {
+                'chunk': result['chunks'],
+                'from': lower,
+                'to': upper,
+                'inserted': inserted,
+                'updated': updated,
+            }
+            logger.info(f"✅ Sync chunk {result['chunks']} ({lower!r}, {upper!r}]: "
+                        f"{inserted} baru, {updated} diperbarui")
+            if on_progress:
+                on_progress(chunk_info)
+            lower = upper
+
+        save_state(cursor, *watermark, full=True)
+
+    except Exception as e:
+        logger.error(f"❌ Error in sync_all: {str(e)}")
+        result.update({'success': False, 'message': str(e)})
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+    return _finish(result, 'full', started)
+
+
+def _finish(result, mode, started):
+    result['mode'] = mode
+    result['success_count'] = result['inserted'] + result['updated']
+    result['error_count'] = 0 if result['success'] else 1
+    result['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+    return result
+
+
+def sync_incremental(chunk_size=SYNC_CHUNK_SIZE, on_progress=None):
+    """
+    Sinkronkan hanya baris dengan (TimeTemp, id_input) setelah watermark tersimpan.
+    Watermark maju di transaksi yang sama dengan upsert tiap chunk.
+    Perubahan lewat update-input-order sudah disinkronkan langsung; baris dengan TimeTemp
+    NULL atau di belakang watermark ditangkap oleh full sync berkala.
+    """
+    conn = None
+    cursor = None
+    started = time.monotonic()
+    result = {'success': True, 'inserted': 0, 'updated': 0, 'chunks': 0}
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        state = load_state(cursor)
+        last_time, last_id = (state['last_time'], state['last_id'] or '') if state else (None, '')
+
+        while True:
+            if last_time is None:
+                cursor.execute("""
+                    SELECT TimeTemp, id_input FROM table_input_order
+                    WHERE TimeTemp IS NOT NULL
+                    ORDER BY TimeTemp, id_input LIMIT %s
+                """, (chunk_size,))
+            else:
+                cursor.execute("""
+                    SELECT TimeTemp, id_input FROM table_input_order
+                    WHERE TimeTemp > %s OR (TimeTemp = %s AND id_input > %s)
+                    ORDER BY TimeTemp, id_input LIMIT %s
+                """, (last_time, last_time, last_id, chunk_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            ids = [row[1] for row in rows]
+            where = f"i.id_input IN ({', '.join(['%s'] * len(ids))})"
+
+            conn.start_transaction()
+            try:
+                cursor.execute(COUNT_RANGE_SQL.format(where=where), ids)
+                inserted, updated = cursor.fetchone()
+                cursor.execute(UPSERT_PESANAN_SQL.format(where=where), ids)
+                last_time, last_id = rows[-1]
+                save_state(cursor, last_time, last_id)
+                outbox.stage(cursor, [{'table': 'table_pesanan', 'id_input': id_input, 'action': 'upsert',
+                                       'fields': {}} for id_input in ids])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            inserted, updated = int(inserted), int(updated)
+            result['chunks'] += 1
+            result['inserted'] += inserted
+            result['updated'] += updated
+            logger.info(f"✅ Sync incremental chunk {result['chunks']} s/d ({last_time}, {last_id!r}): "
+                        f"{inserted} baru, {updated} diperbarui")
+            if on_progress:
+                on_progress({
+                    'chunk': result['chunks'],
+                    'to': last_id,
+                    'inserted': inserted,
+                    'updated': updated,
+                })
+
+    except Exception as e:
+        logger.error(f"❌ Error in sync_incremental: {str(e)}")
+        result.update({'success': False, 'message': str(e)})
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+    return _finish(result, 'incremental', started)
+
+
+def needs_full_sync(full_interval=FULL_SYNC_INTERVAL):
+    """ True jika belum ada watermark atau full sync terakhir sudah lewat `full_interval` """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        state = load_state(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+    return state is None or state['full_age'] is None or state['full_age'] >= full_interval
+
+
+def sync(mode='full', chunk_size=SYNC_CHUNK_SIZE, on_progress=None, full_interval=FULL_SYNC_INTERVAL):
+    """
+    mode='full'        : rescan seluruh table_input_order
+    mode='incremental' : hanya baris setelah watermark
+    mode='auto'        : incremental, kecuali full sync terakhir sudah lewat `full_interval`
+    """
+    if mode == 'auto':
+        try:
+            mode = 'full' if needs_full_sync(full_interval) else 'incremental'
+        except Exception as e:
+            logger.error(f"❌ Gagal membaca state sync, fallback ke full: {str(e)}")
+            mode = 'full'
+    if mode == 'incremental':
+        return sync_incremental(chunk_size, on_progress)
+    if mode == 'full':
+        return sync_all(chunk_size, on_progress)
+    raise ValueError(f"Mode sync tidak dikenal: {mode}")
@@ -0,0 +1,77 @@
+import hashlib
+import logging
+from functools import wraps
+
+from flask import request
+
+from project_api.db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+def bump(cursor, *tables):
+    """ Naikkan versi `tables` (panggil sebelum commit mutasi) """
+    if not tables:
+        return
+    placeholders = ', '.join(['(%s, 1)'] * len(tables))
+    cursor.execute(
+        f"INSERT INTO table_versions (table_name, version) VALUES {placeholders} "
+        "ON DUPLICATE KEY UPDATE version = version + 1",
+        list(tables)
+    )
+
+
+def get_versions(cursor, tables):
+    """ Versi tiap tabel; tabel yang belum pernah di-bump bernilai 0 """
+    placeholders = ', '.join(['%s'] * len(tables))
+    cursor.execute(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+        list(tables)
+    )
+    versions = {table: 0 for table in tables}
+    for row in cursor.fetchall():
+        table_name, version = row.values() if isinstance(row, dict) else row
+        versions[table_name] = version
+    return versions
+
+
+def make_etag(versions, variant=''):
+    """ ETag dari versi tabel + variasi request (query string menentukan isi body) """
+    token = ';'.join(f"{table}={versions[table]}" for table in sorted(versions))
+    return hashlib.sha1(f"{token}|{variant}".encode()).hexdigest()[:20]
+
+
+def versioned(*tables):
+    """
+    Decorator endpoint list: kirim ETag dan jawab 304 tanpa menjalankan query penuh
+    jika If-None-Match klien masih cocok dengan versi tabel saat ini.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            conn = None
+            cursor = None
+            etag = None
+            try:
+                conn = get_db_connection()
+                cursor = conn.cursor()
+                etag = make_etag(get_versions(cursor, tables), request.query_string.decode())
+            except Exception as e:
+                # Tanpa versi, tetap layani request secara normal
+                logger.warning(f"⚠️ Gagal membaca versi tabel {tables}: {e}")
+            finally:
+                if cursor:
+                    cursor.close()
+                if conn:
+                    conn.close()
+
+            if etag and request.if_none_match.contains(etag):
+                return '', 304, {'ETag': f'"{etag}"'}
+
+            rv = view(*args, **kwargs)
+            if etag:
+                response, status = (rv[0], rv[1]) if isinstance(rv, tuple) else (rv, 200)
+                if status == 200 and hasattr(response, 'set_etag'):
+                    response.set_etag(etag)
+            return rv
+        return wrapper
+    return decorator